@@ -0,0 +1,57 @@
+import argparse
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+from firestore_writer import FirestoreWriter
+from geohash import geohash_fields, prefix_field, GEOHASH_FIELD, GEOHASH_PRECISIONS
+
+# 🔑 Replace with your Firebase service account key
+cred = credentials.Certificate(
+    r"C:\Users\Acer\Documents\UiTM\SEM 6\Code\fyp25\android\app\service-account-file.json"
+)
+firebase_admin.initialize_app(cred)
+
+db = firestore.client()
+
+COLLECTIONS = ["melaka_places", "melaka"]
+
+# Coordinates plus whatever geohash fields are already stored
+BACKFILL_FIELDS = ["latitude", "longitude", GEOHASH_FIELD] + [prefix_field(p) for p in GEOHASH_PRECISIONS]
+
+
+# === 📡 Add or refresh geohash fields on every document with coordinates ===
+def backfill_collection(collection, dry_run=False):
+    print(f"🔍 Scanning '{collection}'...")
+    updated = unchanged = missing = 0
+
+    with FirestoreWriter(db) as writer:
+        for doc in db.collection(collection).select(BACKFILL_FIELDS).stream():
+            data = doc.to_dict()
+            fields = geohash_fields(data.get("latitude"), data.get("longitude"))
+
+            if not fields:
+                missing += 1
+                continue
+            if all(data.get(k) == v for k, v in fields.items()):
+                unchanged += 1
+                continue
+
+            updated += 1
+            if not dry_run:
+                writer.update(doc.reference, fields)
+
+    verb = "would update" if dry_run else "updated"
+    print(f"📡 '{collection}': {updated} {verb}, {unchanged} already current, {missing} without coordinates")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill geohash fields on existing place documents")
+    parser.add_argument("--collection", action="append", choices=COLLECTIONS,
+                        help="Collection to backfill (repeatable, default: all)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only count the documents that would change")
+    args = parser.parse_args()
+
+    for name in args.collection or COLLECTIONS:
+        backfill_collection(name, dry_run=args.dry_run)
@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# === ⚙️ Pool defaults ===
+DEFAULT_BROWSERS = 4            # headless sessions running side by side
+DEFAULT_PAGES_PER_BROWSER = 20  # a session is restarted after this many pages
+
+
+# === 🌐 Headless Chrome with the flags every scraper uses ===
+def make_chrome(headless=True, service=None):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1366,900")
+    if service is not None:
+        return webdriver.Chrome(service=service, options=options)
+    return webdriver.Chrome(options=options)
+
+
+class BrowserPool:
+    """
+    Runs ``fn(driver, url)`` over many URLs on ``size`` browser sessions.
+
+    Each worker thread owns one driver from ``factory`` and reuses it page
+    after page. The driver is quit and replaced after ``pages_per_browser``
+    pages (Chrome grows over long runs) or after a page raises, in case
+    the session itself is broken. ``map`` returns results in input order;
+    a page that fails yields ``None``.
+    """
+
+    def __init__(self, factory=make_chrome, size=DEFAULT_BROWSERS,
+                 pages_per_browser=DEFAULT_PAGES_PER_BROWSER):
+        self.factory = factory
+        self.size = size
+        self.pages_per_browser = pages_per_browser
+        self._local = threading.local()
+        self._drivers = set()
+        self._lock = threading.Lock()
+        self.started = 0
+        self.failed = 0
+
+    # === 🚗 This thread's driver, started or recycled as needed ===
+    def _driver(self):
+        local = self._local
+        if getattr(local, 'driver', None) is not None and local.pages >= self.pages_per_browser:
+            self._quit(local.driver)
+            local.driver = None
+
+        if getattr(local, 'driver', None) is None:
+            local.driver = self.factory()
+            local.pages = 0
+            with self._lock:
+                self._drivers.add(local.driver)
+                self.started += 1
+        return local.driver
+
+    def _quit(self, driver):
+        with self._lock:
+            self._drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _run(self, fn, url):
+        driver = self._driver()
+        self._local.pages += 1
+        try:
+            return fn(driver, url)
+        except Exception as e:
+            print(f"❌ {url}: {e}")
+            with self._lock:
+                self.failed += 1
+            self._quit(driver)
+            self._local.driver = None
+            return None
+
+    def map(self, fn, urls):
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda url: self._run(fn, url), urls))
+
+    def close(self):
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._quit(driver)
+        print(f"🌐 Browsers: {self.started} sessions started, {self.failed} pages failed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,53 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# === ⏱️ Wait defaults (seconds) ===
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+SETTLE_TIME = 0.3   # how long a list must stay unchanged
+
+
+# === 🧱 Block until condition(driver) is truthy; its value, or None on timeout ===
+def wait_for(driver, condition, timeout=DEFAULT_TIMEOUT, poll=POLL_INTERVAL):
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except TimeoutException:
+        return None
+
+
+def wait_document_ready(driver, timeout=DEFAULT_TIMEOUT):
+    return wait_for(driver, lambda d: d.execute_script("return document.readyState") == 'complete', timeout)
+
+
+# === 👻 Element gone or hidden (e.g. a modal after closing it) ===
+def wait_gone(driver, locator, timeout=DEFAULT_TIMEOUT):
+    return bool(wait_for(driver, EC.invisibility_of_element_located(locator), timeout))
+
+
+class _Settled:
+    """Truthy once ``measure(driver)`` is ready and unchanged for ``settle`` seconds."""
+
+    def __init__(self, measure, settle, ready=lambda value: True):
+        self.measure = measure
+        self.settle = settle
+        self.ready = ready
+        self.last = None
+        self.since = None
+
+    def __call__(self, driver):
+        value = self.measure(driver)
+        now = time.monotonic()
+        if value != self.last or not self.ready(value):
+            self.last, self.since = value, now
+            return False
+        return now - self.since >= self.settle
+
+
+# === 📋 Rows rendered: at least one match and the count stopped growing ===
+# Returns whatever matches at the end, so a timeout yields the rows seen so far
+def wait_rows(driver, locator, timeout=DEFAULT_TIMEOUT, settle=SETTLE_TIME):
+    wait_for(driver, _Settled(lambda d: len(d.find_elements(*locator)), settle, ready=lambda n: n > 0), timeout)
+    return driver.find_elements(*locator)
@@ -0,0 +1,28 @@
+import argparse
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+from nearest_places import refresh_nearby, DEFAULT_K
+
+# 🔑 Replace with your Firebase service account key
+cred = credentials.Certificate(
+    r"C:\Users\Acer\Documents\UiTM\SEM 6\Code\fyp25\android\app\service-account-file.json"
+)
+firebase_admin.initialize_app(cred)
+
+db = firestore.client()
+
+COLLECTIONS = ["melaka_places", "melaka"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute each place's nearest places")
+    parser.add_argument("--collection", action="append", choices=COLLECTIONS,
+                        help="Collection to process (repeatable, default: melaka_places)")
+    parser.add_argument("--k", type=int, default=DEFAULT_K,
+                        help="Nearby places stored per document")
+    args = parser.parse_args()
+
+    for name in args.collection or ["melaka_places"]:
+        refresh_nearby(db, name, k=args.k)
@@ -0,0 +1,80 @@
+# === 📦 Required Libraries ===
+import argparse
+import firebase_admin
+from firebase_admin import credentials, firestore, storage
+from crawl_engine import CrawlEngine
+from crawl_profiles import PROFILES
+from image_pipeline import ImagePipeline
+from nearest_places import refresh_nearby, DEFAULT_K
+from places_client import PlacesClient
+from rate_limiter import RateLimiter, DEFAULT_RATE
+from response_cache import ResponseCache
+from tiling import MELAKA_BOUNDS
+
+# === 🔧 FIREBASE SETUP ===
+# Load your Firebase project's service account key
+cred = credentials.Certificate(
+    r"C:\Users\Acer\Documents\UiTM\SEM 6\Code\fyp25\android\app\service-account-file.json"
+)
+
+# Initialize Firebase Admin SDK with Firestore and Cloud Storage
+firebase_admin.initialize_app(cred, {
+    'storageBucket': 'fyp2025-88e54.firebasestorage.app'  # ✅ Correct bucket name
+})
+
+db = firestore.client()
+bucket = storage.bucket()
+
+# === 🔑 GOOGLE PLACES API KEY ===
+API_KEY = ''  # Replace with your actual key
+
+# One pooled client, response cache and details memo for every profile of a run
+places_client = PlacesClient(API_KEY, cache=ResponseCache())
+
+# === 🖼️ Parallel, content-addressed photo uploads ===
+image_pipeline = ImagePipeline(bucket, fetch=places_client.download)
+
+
+# === 🚀 ENTRY POINT ===
+def main(default_profiles=None, description="Crawl Melaka places into Firestore"):
+    """Runs ``--profile``s, else ``default_profiles``, else every profile, as one crawl."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--profile', action='append', choices=list(PROFILES),
+                        help="Crawl profile to run; repeat to run several in one crawl")
+    parser.add_argument('--offline', action='store_true',
+                        help="Replay cached Places responses only, without touching the network")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch new or stale places and only write documents that changed")
+    parser.add_argument('--nearby-k', type=int, default=DEFAULT_K,
+                        help="Nearest places precomputed per document (0 to skip)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the last run of the same profiles from its journal instead of starting over")
+    parser.add_argument('--qps', type=float, default=DEFAULT_RATE,
+                        help="Places requests per second across all workers (the quota ceiling)")
+    args = parser.parse_args()
+    places_client.cache.offline = args.offline
+    places_client.limiter = RateLimiter(args.qps)
+
+    names = list(dict.fromkeys(args.profile or default_profiles or PROFILES))
+    engine = CrawlEngine(db, places_client, [PROFILES[name] for name in names], image_pipeline,
+                         MELAKA_BOUNDS, incremental=args.incremental)
+
+    print(f"🚀 Starting crawl in Melaka: {', '.join(names)}")
+    try:
+        engine.run(resume=args.resume)
+    finally:
+        image_pipeline.close()
+        places_client.close()
+
+    # 🧭 Related places for detail pages, over the whole collection
+    if args.nearby_k > 0:
+        for collection in engine.nearby_collections():
+            refresh_nearby(db, collection, k=args.nearby_k)
+    print(places_client.cache.summary())
+    print(places_client.summary())
+    print("\n🎉 Upload complete!")
+
+
+# === Execute when run directly ===
+if __name__ == '__main__':
+    main()
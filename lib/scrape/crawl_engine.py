@@ -0,0 +1,426 @@
+import threading
+from collections import Counter, defaultdict
+
+from google.cloud.firestore import ArrayUnion
+
+from crawl_journal import CrawlJournal, WRITTEN, UNCHANGED, REMOVED
+from crawl_manifest import CrawlManifest, content_hash, place_doc_id
+from crawl_profiles import IMAGES_STORED, IMAGES_LINKED
+from firestore_writer import FirestoreWriter
+from geohash import geohash_fields
+from image_pipeline import DETAIL, SOURCE_MAXWIDTH
+from pipeline import Pipeline
+from place_index import PlaceIndex
+from place_normalizer import normalize_places, search_records, SeenPlaces
+from places_client import DETAILS_FIELDS, REFRESH_FIELDS
+from snapshot import SnapshotWriter
+from tiling import stream_tiles, MELAKA_BOUNDS
+
+# === 🚰 Stage sizes ===
+NORMALIZE_BATCH = 50        # search hits normalized together
+DETAILS_BATCH = 16          # places whose details are fanned out together (asyncio, client.max_concurrency)
+DETAILS_WORKERS = 2         # batches in flight, so one slow place does not stall the stage
+IMAGE_WORKERS = 4
+WRITE_BATCH = 50            # small commits, so a crash loses little
+MANIFEST_SAVE_EVERY = 100   # writes between manifest checkpoints
+
+# Width of the Google photo URLs saved by IMAGES_LINKED profiles
+LINKED_PHOTO_WIDTH = 400
+
+# Field the keyword tags of every profile that found a place are merged into
+TAGS_FIELD = 'tags_suggested_by_ml'
+
+# === 📊 Per-profile counters, in summary order ===
+SUMMARY_COUNTS = [
+    ('selected', 'selected'),
+    ('filtered', 'filtered out'),
+    ('written', 'written'),
+    ('unchanged', 'unchanged'),
+    ('fresh', 'fresh'),
+    ('existing', 'already stored'),
+    ('shared', 'tagged on another profile\'s place'),
+    ('claimed', 'taken by another profile'),
+    ('done', 'done before the resume'),
+    ('removed', 'no longer on Google'),
+    ('failed', 'failed details'),
+]
+
+# Selected places that never reach this run's snapshot; any of them makes it partial.
+# Claimed places are in the snapshot of the profile that wrote them
+SNAPSHOT_GAPS = ('fresh', 'existing', 'done', 'failed')
+
+
+# === 🧩 Search record + details -> full place ===
+def with_details(record, details):
+    return {
+        **record,
+        'rating_count': details.get('user_ratings_total'),
+        'reviews': details.get('reviews'),
+        'opening_hours': details.get('opening_hours'),
+        'photos': details.get('photos'),
+    }
+
+
+class _Claim:
+    """A place one profile writes on behalf of every profile of its collection that found it."""
+
+    def __init__(self, tags=None):
+        self.tags = tags        # keyword tags of every claimant so far, None when none tags
+        self.shared = False     # tags came from another profile than the writer
+        self.closed = False     # the writer took the tags: later ones are written on their own
+
+
+class _ProfileRun:
+    """Per-profile state of one engine run."""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.seen = SeenPlaces()    # normalize dedup across batches
+        self.found = set()          # place_ids routed to this profile
+        self.snapshot = None
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.counts[key] += n
+
+    def summary(self):
+        parts = [f"{self.counts[key]} {label}" for key, label in SUMMARY_COUNTS if self.counts[key]]
+        return f"📍 {self.profile.name} -> '{self.profile.collection}': {', '.join(parts) or 'nothing found'}"
+
+
+class CrawlEngine:
+    """
+    Runs one or more ``CrawlProfile``s as a single streamed crawl:
+
+        crawl -> normalize -> details -> images -> write
+
+    Queries shared by several profiles are searched once and routed to
+    each of them. The Places client (pooled HTTP, response cache, rate
+    limiter, details memo) and the image pipeline are shared, and so is,
+    per target collection, the manifest, the index of places stored
+    before the run and the places claimed in this run. A place found by
+    several profiles is fetched and written once, with the union of their
+    tags, so the document does not depend on which profile got there
+    first (profiles of one collection must share an image policy for the
+    same reason). Progress is journaled, so ``run(resume=True)``
+    continues a failed run.
+    """
+
+    def __init__(self, db, client, profiles, image_pipeline=None, bounds=MELAKA_BOUNDS, incremental=False):
+        if image_pipeline is None and any(p.images == IMAGES_STORED for p in profiles):
+            raise ValueError("profiles that store images need an image_pipeline")
+        images = {}
+        for p in profiles:
+            if images.setdefault(p.collection, p.images) != p.images:
+                raise ValueError(f"profiles writing to '{p.collection}' must share one image policy")
+
+        self.db = db
+        self.client = client
+        self.image_pipeline = image_pipeline
+        self.bounds = bounds
+        self.incremental = incremental
+        self.runs = [_ProfileRun(p) for p in profiles]
+
+        # Each unique query routes its hits to (profile run, the profile's own query index)
+        self.queries = []
+        self.routes = []
+        for run in self.runs:
+            for local_index, query in enumerate(run.profile.queries):
+                if query not in self.queries:
+                    self.queries.append(query)
+                    self.routes.append([])
+                self.routes[self.queries.index(query)].append((run, local_index))
+
+        collections = {p.collection for p in profiles}
+        self.manifests = {c: CrawlManifest(c) for c in collections}
+        self.indexes = {}   # stored places per collection, loaded by run()
+        self.claims = {c: {} for c in collections}  # place_id -> _Claim
+        self.journal = CrawlJournal('+'.join(p.name for p in profiles))
+        self.writer = None
+        self.written = 0
+        self._lock = threading.Lock()
+
+    # === 🧾 What makes two runs the same crawl (a journal only resumes its own) ===
+    def params(self):
+        return {
+            'profiles': [run.profile.name for run in self.runs],
+            'queries': self.queries,
+            'bounds': list(self.bounds),
+            'incremental': self.incremental,
+        }
+
+    def nearby_collections(self):
+        return sorted({run.profile.collection for run in self.runs if run.profile.nearby})
+
+    # === 🔍 Source: one tiled crawl for every profile's queries ===
+    def _crawl(self, emit):
+        for run in self.runs:
+            print(f"🔍 {run.profile.name}: {', '.join(run.profile.labels)}")
+
+        # Called under the crawl's lock, so the found sets need no lock of their own
+        def route(query_index, place):
+            place_id = place['place_id']
+            for run, local_index in self.routes[query_index]:
+                if place_id not in run.found:
+                    run.found.add(place_id)
+                    emit((run, local_index, place))
+
+        stream_tiles(self.client, self.queries, route, self.bounds, journal=self.journal, per_query=True)
+
+    # === 🧼 Normalize each profile's hits, then apply its filters ===
+    def _select(self, items, emit):
+        hits = defaultdict(list)
+        for run, local_index, place in items:
+            hits[run].append((local_index, place))
+
+        for run, profile_hits in hits.items():
+            records = normalize_places(search_records(profile_hits, run.profile.labels), seen=run.seen, report=False)
+            for record in records:
+                reason = self._skip_reason(run.profile, record)
+                if reason:
+                    run.count(reason)
+                    continue
+                run.count('selected')
+                emit((run, record))
+
+    def _skip_reason(self, profile, record):
+        place_id = record['place_id']
+        name = record['name'] or ''
+        collection = profile.collection
+
+        if profile.exclude_types.intersection(record['types'] or []):
+            return 'filtered'
+        if profile.name_keywords and not any(k in name.lower() for k in profile.name_keywords):
+            return 'filtered'
+
+        # ⏩ Stored before this run (the index is not updated during it, so this does not race)
+        if profile.skip_existing and self.indexes[collection].contains(place_id, name):
+            print(f"⏩ Skipped (already exists): {name}")
+            return 'existing'
+
+        # 🤝 Another profile of this run writes it: only add our tags
+        claim = self.claims[collection].get(place_id)
+        if claim is not None:
+            return self._share(profile, record, claim)
+
+        # ⏯️ Resumed: finished by the interrupted run
+        if self.journal.is_done(place_id, collection):
+            return 'done'
+
+        # ⏩ Incremental: known places fetched recently need no details call
+        if self.incremental and not profile.skip_existing and self.manifests[collection].is_fresh(place_id):
+            return 'fresh'
+
+        # 🤝 First profile to reach a place writes it for this run (normalize has one worker)
+        self.claims[collection][place_id] = _Claim(self._tags_for(profile, record))
+        return None
+
+    def _tags_for(self, profile, record):
+        return profile.tags.tags_for(record['name'], record['types']) if profile.tags is not None else None
+
+    # === 🏷️ Tags of a later profile: into the pending write, or a write of their own ===
+    def _share(self, profile, record, claim):
+        tags = self._tags_for(profile, record)
+        if tags is None:
+            return 'claimed'
+        with self._lock:
+            late = claim.closed
+            if not late:
+                claim.tags = list(dict.fromkeys((claim.tags or []) + tags))
+                claim.shared = True
+        if late:
+            self._write_tags(profile.collection, record['place_id'], tags)
+        return 'shared'
+
+    # The writer takes every tag gathered so far; later profiles write theirs directly
+    def _close_claim(self, collection, place_id):
+        claim = self.claims[collection][place_id]
+        with self._lock:
+            claim.closed = True
+            return claim.tags, claim.shared
+
+    # ArrayUnion: tags from several profiles (and try.py) add up whatever order they land in
+    def _write_tags(self, collection, place_id, tags):
+        if tags:
+            doc_ref = self.db.collection(collection).document(self.doc_id_for(collection, place_id))
+            self.writer.set(doc_ref, {TAGS_FIELD: ArrayUnion(tags)}, merge=True)
+
+    # === 🎭 Smallest details mask: known documents keep their photos ===
+    def details_fields(self, profile, place_id):
+        known = self.incremental and not profile.skip_existing and self.manifests[profile.collection].get(place_id)
+        return REFRESH_FIELDS if known or profile.images is None else DETAILS_FIELDS
+
+    # === ⚡ One asyncio fan-out per batch and mask ===
+    def _fetch_details(self, items, emit):
+        by_mask = defaultdict(list)
+        for run, record in items:
+            by_mask[self.details_fields(run.profile, record['place_id'])].append((run, record))
+
+        for fields, group in by_mask.items():
+            all_details = self.client.get_details_for_page([record['place_id'] for _, record in group], fields)
+            for (run, record), details in zip(group, all_details):
+                self._with_place_details(run, record, details, emit)
+
+    def _with_place_details(self, run, record, details, emit):
+        if details is None:
+            # 🚫 Closed or removed: finished for good, --resume does not ask again
+            run.count('removed')
+            self.journal.record_place(record['place_id'], REMOVED, scope=run.profile.collection)
+            return
+        if not details:
+            run.count('failed')  # ❌ failed every retry: left for --resume rather than written empty
+            return
+
+        place = with_details(record, details)
+        run.snapshot.add_places([place])
+        plan = self.plan_upload(run.profile, place)
+        if plan is None:
+            run.count('unchanged')
+            tags, shared = self._close_claim(run.profile.collection, place['place_id'])
+            if shared:
+                self._write_tags(run.profile.collection, place['place_id'], tags)
+            return
+        emit((run, place, *plan))
+
+    # === 🧮 (record, hash, existing doc id or None), or None when nothing changed ===
+    def plan_upload(self, profile, place):
+        manifest = self.manifests[profile.collection]
+        place_id = place['place_id']
+        record_hash = content_hash(place)
+        entry = manifest.get(place_id)
+
+        # ⏩ Incremental: same content as the last write, nothing to upload
+        if self.incremental and entry and not manifest.has_changed(place_id, record_hash):
+            manifest.touch(place_id)
+            self.journal.record_place(place_id, UNCHANGED, scope=profile.collection)
+            return None
+
+        record = {
+            'place_id': place_id,
+            'name': place['name'],
+            'address': place['address'],
+            'rating': place['rating'],
+            'rating_count': place['rating_count'],
+            'longitude': place['longitude'],
+            'latitude': place['latitude'],
+            **geohash_fields(place['latitude'], place['longitude']),  # 📡 nearby queries by cell
+            'types': place['types'],
+            'reviews': place['reviews'],
+            'opening_hours': place['opening_hours'],
+            # 🔒 'searched_type' is used internally, not uploaded
+        }
+        return record, record_hash, entry['doc_id'] if self.incremental and entry else None
+
+    # === 🖼️ Photo fields by the profile's image policy ===
+    def photo_fields(self, profile, place):
+        refs = place.get('photos') or []
+        if profile.images == IMAGES_STORED:
+            variants = self.image_pipeline.upload_groups(
+                [[self.client.photo_url(ref, SOURCE_MAXWIDTH) for ref in refs]])[0]
+            return {
+                'photos': [v[DETAIL] for v in variants],  # what the gallery shows
+                'photo_variants': variants,               # every size, e.g. thumb for cards
+            }
+        if profile.images == IMAGES_LINKED:
+            return {'photos': [self.client.photo_url(ref, LINKED_PHOTO_WIDTH) for ref in refs]}
+        return {}
+
+    def _attach_images(self, item, emit):
+        run, place, record, record_hash, doc_id = item
+        if not doc_id:  # only new documents get photos
+            record = {**record, **self.photo_fields(run.profile, place)}
+        emit((run, place, record, record_hash, doc_id))
+
+    # === 🆔 A place's document: the one it already has (manifest, then Firestore), else named after place_id ===
+    def doc_id_for(self, collection, place_id):
+        entry = self.manifests[collection].get(place_id)
+        if entry:
+            return entry['doc_id']
+        # Legacy auto-id documents are reused, so no second copy is minted next to them
+        return self.indexes[collection].doc_id_for(place_id) or place_doc_id(place_id)
+
+    # The manifest and the journal only record committed writes
+    def _on_success_for(self, run, place_id, record_hash):
+        collection = run.profile.collection
+
+        def on_success(doc_ref):
+            self.manifests[collection].record(place_id, record_hash, doc_ref.id)
+            self.journal.record_place(place_id, WRITTEN, record_hash, doc_ref.id, scope=collection)
+            run.count('written')
+        return on_success
+
+    def _write(self, item, emit):
+        run, place, record, record_hash, doc_id = item
+        collection = run.profile.collection
+        on_success = self._on_success_for(run, record['place_id'], record_hash)
+        tags, _ = self._close_claim(collection, record['place_id'])
+        if tags:
+            record = {**record, TAGS_FIELD: ArrayUnion(tags)}
+
+        if doc_id:
+            # 🔁 Changed place already in Firestore: update fields, keep its photos
+            print(f"🔁 Updating: {place['name']}")
+            doc_ref = self.db.collection(collection).document(doc_id)
+            self.writer.set(doc_ref, record, merge=True, on_success=on_success)
+        else:
+            # Same id on every run, so a replayed write lands on the same document. Merged, so
+            # fields the scraper does not own (ML tags, nearby, admin edits) survive a rerun
+            print(f"⬆️ Uploading: {place['name']}")
+            doc_ref = self.db.collection(collection).document(self.doc_id_for(collection, record['place_id']))
+            self.writer.set(doc_ref, record, merge=True, on_success=on_success)
+
+        self.written += 1
+        if self.written % MANIFEST_SAVE_EVERY == 0:
+            for manifest in self.manifests.values():
+                manifest.save()
+
+    # === ▶️ Crawl every profile; returns the number of places that failed ===
+    def run(self, resume=False):
+        self.journal.open(self.params(), resume=resume)
+        for collection, manifest in self.manifests.items():
+            # Writes journaled after the interrupted run's last manifest save
+            for place_id, record_hash, doc_id in self.journal.uploads(collection):
+                manifest.record(place_id, record_hash, doc_id)
+
+        # Load each catalog once; "already stored?" and "under which id?" are then dict lookups
+        for collection in sorted(self.manifests):
+            self.indexes[collection] = PlaceIndex.load(self.db, collection)
+
+        for run in self.runs:
+            run.snapshot = SnapshotWriter(run.profile.name)
+        self.writer = FirestoreWriter(self.db, batch_size=WRITE_BATCH)
+
+        pipeline = (Pipeline(self._crawl)
+                    .batch_stage('normalize', self._select, NORMALIZE_BATCH)
+                    .batch_stage('details', self._fetch_details, DETAILS_BATCH, workers=DETAILS_WORKERS)
+                    .stage('images', self._attach_images, workers=IMAGE_WORKERS)
+                    .stage('write', self._write))
+        completed = False
+        try:
+            pipeline.run()
+            completed = True
+        finally:
+            # Whatever reached the writer is committed, even if a stage failed
+            self.writer.close()
+            for run in self.runs:
+                run.snapshot.close(partial=not completed or any(run.counts[key] for key in SNAPSHOT_GAPS))
+            for manifest in self.manifests.values():
+                manifest.save()
+            if self.image_pipeline is not None:
+                print(self.image_pipeline.summary())
+
+            failed = len(self.writer.failed) + sum(run.counts['failed'] for run in self.runs)
+            # Failed writes and requests are not journaled, so --resume retries exactly those
+            if failed or self.client.failed:
+                print(f"⚠️ {failed} places and {self.client.failed} Places requests failed, "
+                      f"run again with --resume to retry them")
+            elif completed:
+                self.journal.finish()
+
+            for run in self.runs:
+                print(run.summary())
+            print(self.journal.summary())
+            self.journal.close()
+        return failed
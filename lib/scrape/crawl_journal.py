@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+
+from response_cache import CACHE_DIR
+
+# === 🏷️ How a place was finished ===
+WRITTEN = 'written'         # its document was committed
+UNCHANGED = 'unchanged'     # same content as the last write, nothing to do
+REMOVED = 'removed'         # Google no longer lists the place
+
+
+def _canonical(params):
+    return json.dumps(params, sort_keys=True)
+
+
+class CrawlJournal:
+    """
+    Append-only progress log of one crawl, so a failed run can be resumed
+    instead of started over.
+
+    Every line is one JSON entry: the run's parameters, each result page
+    fetched for a (query, cell) tile with its next page token, finished
+    tiles, and finished places (written, unchanged or removed), each within a
+    ``scope`` such as the target collection. Lines are
+    flushed as they are appended, so everything journaled before a crash
+    is there on ``open(..., resume=True)``; a torn last line is ignored.
+    A run that completes is marked finished and is not resumed again.
+    """
+
+    def __init__(self, name, path=None):
+        self.path = path or os.path.join(CACHE_DIR, f"journal_{name}.jsonl")
+        self.resumed = False
+        self._pages = {}    # (query_index, cell) -> [results, next page token]
+        self._tiles = set()
+        self._places = {}   # (scope, place_id) -> journal entry
+        self._file = None
+        self._lock = threading.Lock()
+        self.tiles_replayed = 0
+        self.tiles_continued = 0
+        self.places_before = 0
+
+    # === 📖 Every readable entry of the last run ===
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # written while the process died
+        return entries
+
+    def _replay(self, entries):
+        for entry in entries:
+            kind = entry.get('kind')
+            if kind in ('page', 'reset', 'tile'):
+                key = (entry['query'], tuple(entry['cell']))
+                if kind == 'page':
+                    pages = self._pages.setdefault(key, [[], None])
+                    pages[0].extend(entry['results'])
+                    pages[1] = entry['next']
+                elif kind == 'reset':
+                    self._pages.pop(key, None)
+                else:
+                    self._tiles.add(key)
+            elif kind == 'place':
+                self._places[(entry.get('scope'), entry['place_id'])] = entry
+
+    # === 📒 Start a new journal, or pick up the last one with resume=True ===
+    def open(self, params, resume=False):
+        """
+        ``params`` describes the crawl (queries, bounds, ...). Resuming a
+        journal written for other parameters raises ``ValueError``, since
+        its tiles and places would not line up with this run.
+        """
+        entries = self._read() if resume else []
+        if resume:
+            if not entries or entries[0].get('kind') != 'run':
+                print("📒 No journal to resume, starting a new run")
+                entries = []
+            elif entries[-1].get('kind') == 'finished':
+                print("📒 The last run finished, starting a new one")
+                entries = []
+            elif _canonical(entries[0]['params']) != _canonical(params):
+                raise ValueError(f"{self.path} was written for another crawl, run without --resume")
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if entries:
+            self._replay(entries)
+            self.resumed = True
+            self.places_before = len(self._places)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            print(f"📒 Resuming: {len(self._tiles)} tiles and {self.places_before} places already done")
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._append({'kind': 'run', 'params': params, 'started_at': time.time()})
+
+    def _append(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    # === 🧩 Tiles ===
+    def done_tile(self, query_index, cell):
+        """Every result of a tile finished by the resumed run, or ``None``."""
+        key = (query_index, tuple(cell))
+        if key not in self._tiles:
+            return None
+        with self._lock:
+            self.tiles_replayed += 1
+            pages = self._pages.pop(key, None)
+        return pages[0] if pages else []
+
+    def partial_tile(self, query_index, cell):
+        """``(results so far, next page token)`` of a half-crawled tile."""
+        with self._lock:
+            pages = self._pages.pop((query_index, tuple(cell)), None)
+            if not pages or not pages[1]:
+                return [], None
+            self.tiles_continued += 1
+        return pages[0], pages[1]
+
+    def record_page(self, query_index, cell, results, next_token):
+        self._append({'kind': 'page', 'query': query_index, 'cell': list(cell),
+                      'results': results, 'next': next_token})
+
+    # ⌛ Its page token expired: earlier pages are dropped and the tile starts over
+    def reset_tile(self, query_index, cell):
+        self._append({'kind': 'reset', 'query': query_index, 'cell': list(cell)})
+
+    def record_tile(self, query_index, cell):
+        self._append({'kind': 'tile', 'query': query_index, 'cell': list(cell)})
+
+    # === 📍 Places ===
+    def is_done(self, place_id, scope=None):
+        return (scope, place_id) in self._places
+
+    def record_place(self, place_id, status, record_hash=None, doc_id=None, scope=None):
+        entry = {'kind': 'place', 'place_id': place_id, 'status': status,
+                 'hash': record_hash, 'doc_id': doc_id, 'scope': scope}
+        self._places[(scope, place_id)] = entry
+        self._append(entry)
+
+    # === ⬆️ (place_id, hash, doc id) of every committed write in `scope` ===
+    def uploads(self, scope=None):
+        return [(e['place_id'], e['hash'], e['doc_id'])
+                for (s, _), e in list(self._places.items()) if s == scope and e['status'] == WRITTEN]
+
+    # === 🏁 Nothing left to resume ===
+    def finish(self):
+        self._append({'kind': 'finished', 'finished_at': time.time()})
+
+    def close(self):
+        if self._file is not None:
+            with self._lock:
+                self._file.close()
+                self._file = None
+
+    def summary(self):
+        done = len(self._places) - self.places_before
+        return (f"📒 Journal: {self.tiles_replayed} tiles replayed, {self.tiles_continued} continued "
+                f"from a page token, {self.places_before} places done before this run, {done} now")
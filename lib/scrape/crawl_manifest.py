@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from response_cache import CACHE_DIR
+
+# === ⏱️ A place is re-fetched once its last fetch is older than this ===
+DEFAULT_MAX_AGE_DAYS = 7
+
+# Fields that change on every request and say nothing about the place itself
+VOLATILE_FIELDS = {'photos', 'searched_type'}
+VOLATILE_HOURS_FIELDS = {'open_now'}
+
+
+# === 🧼 Drop volatile parts so equal places hash equally ===
+def normalize_for_hash(record):
+    normalized = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+
+    hours = normalized.get('opening_hours')
+    if isinstance(hours, dict):
+        normalized['opening_hours'] = {k: v for k, v in hours.items() if k not in VOLATILE_HOURS_FIELDS}
+
+    reviews = normalized.get('reviews')
+    if isinstance(reviews, list):
+        normalized['reviews'] = sorted(reviews, key=lambda r: (r.get('time') or 0, r.get('author_name') or ''))
+
+    return normalized
+
+
+# === #️⃣ Content hash of a place record ===
+def content_hash(record):
+    payload = json.dumps(normalize_for_hash(record), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# === 🆔 Deterministic Firestore document id for a place ===
+# Writing a place twice (a resumed or repeated run) hits the same document
+def place_doc_id(place_id):
+    # Place IDs are URL-safe; '/' is the one character Firestore ids forbid
+    return place_id.replace('/', '_')
+
+
+class CrawlManifest:
+    """
+    Local record of every place already written, keyed by ``place_id``.
+
+    Each entry keeps the Firestore document id, the content hash of the
+    last written record and when the place was last fetched, so a later
+    run can skip fresh places and only rewrite documents that changed.
+    """
+
+    def __init__(self, name, path=None, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.path = path or os.path.join(CACHE_DIR, f"manifest_{name}.json")
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.entries = {}
+        self._lock = threading.Lock()  # writes are recorded from writer threads
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, place_id):
+        return self.entries.get(place_id)
+
+    # === 🟢 Known and fetched recently enough to skip details ===
+    def is_fresh(self, place_id, now=None):
+        entry = self.entries.get(place_id)
+        if not entry:
+            return False
+        return (now or time.time()) - entry.get('fetched_at', 0) <= self.max_age
+
+    def has_changed(self, place_id, record_hash):
+        entry = self.entries.get(place_id)
+        return not entry or entry.get('hash') != record_hash
+
+    def record(self, place_id, record_hash, doc_id):
+        with self._lock:
+            self.entries[place_id] = {
+                'hash': record_hash,
+                'doc_id': doc_id,
+                'fetched_at': time.time(),
+            }
+
+    # === 🔁 Fetched again but unchanged: just bump the timestamp ===
+    def touch(self, place_id):
+        with self._lock:
+            if place_id in self.entries:
+                self.entries[place_id]['fetched_at'] = time.time()
+
+    # === 💾 Atomic save (write to temp file, then rename) ===
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            entries = dict(self.entries)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
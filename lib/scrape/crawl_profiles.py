@@ -0,0 +1,55 @@
+from collections import namedtuple
+
+from tag_rules import KEYWORD_RULES
+
+# === 🖼️ Image policies ===
+IMAGES_STORED = 'stored'    # resized variants uploaded to Firebase Storage
+IMAGES_LINKED = 'linked'    # Google photo URLs saved as they are
+IMAGES_NONE = None
+
+
+class CrawlProfile(namedtuple('CrawlProfile', 'name queries labels collection name_keywords '
+                                              'exclude_types skip_existing tags images nearby')):
+    """
+    One scraper, declared as data for ``CrawlEngine``.
+
+    ``queries`` are ``PlacesClient.nearby_search_pages`` keyword arguments
+    and ``labels`` their ``searched_type`` values. Normalized places are
+    kept when their lowercased name contains one of ``name_keywords`` (any
+    name when empty) and none of their types is in ``exclude_types``. With
+    ``skip_existing`` a place already in ``collection`` (by place_id or
+    name) is left alone; otherwise it is refreshed through the collection's
+    manifest. ``tags`` is a ``RuleSet`` whose ``tags_for`` is added to
+    ``tags_suggested_by_ml`` (also for places another profile writes),
+    ``images`` one of the ``IMAGES_*`` policies (the same for every
+    profile of a collection), and ``nearby`` asks for the collection's
+    nearest places to be rebuilt after the run.
+    """
+    __slots__ = ()
+
+
+def profile(name, types=(), keywords=(), collection='melaka_places', name_keywords=(), exclude_types=(),
+            skip_existing=False, tags=None, images=IMAGES_STORED, nearby=False):
+    queries = [{'place_type': t} for t in types] + [{'keyword': k} for k in keywords]
+    return CrawlProfile(name, queries, list(types) + list(keywords), collection,
+                        tuple(k.lower() for k in name_keywords), frozenset(exclude_types),
+                        skip_existing, tags, images, nearby)
+
+
+# === 📋 Every scraper the engine can run, by name ===
+PROFILES = {p.name: p for p in [
+    # Tourism catalog: every type, refreshed in place on later runs
+    profile('melaka_places', types=[
+        'tourist_attraction', 'museum', 'art_gallery', 'park',
+        'beach', 'campground', 'shopping_mall', 'cafe',
+        'bay', 'outlet_mall', 'night_market', 'restaurant',
+    ], nearby=True),
+    # Beaches by keyword; hotels and resorts named after a beach are not beaches
+    profile('beach_places', keywords=['beach', 'pantai'], name_keywords=['beach', 'pantai'],
+            exclude_types=['lodging'], skip_existing=True),
+    # Mosques, tagged with the keyword rules
+    profile('mosque', keywords=['masjid', 'mosque'], skip_existing=True, tags=KEYWORD_RULES),
+    # Main attractions for the older 'melaka' collection, photos linked from Google
+    profile('scrape_places', types=['tourist_attraction', 'museum', 'art_gallery', 'park'],
+            collection='melaka', images=IMAGES_LINKED),
+]}
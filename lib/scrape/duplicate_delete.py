@@ -1,6 +1,15 @@
+import argparse
+from collections import defaultdict
+
 import firebase_admin
 from firebase_admin import credentials, firestore
 
+from crawl_manifest import CrawlManifest, place_doc_id
+from firestore_writer import FirestoreWriter
+from geohash import encode, neighbors, precision_for_radius
+from place_index import normalize_name
+from tiling import haversine_m
+
 # 🔑 Replace with your Firebase service account key
 cred = credentials.Certificate(
     r"C:\Users\Acer\Documents\UiTM\SEM 6\Code\fyp25\android\app\service-account-file.json"
@@ -9,35 +18,139 @@ firebase_admin.initialize_app(cred)
 
 db = firestore.client()
 
-def clean_duplicate_places():
-    print("🔍 Fetching documents from 'melaka_places'...")
-    docs = db.collection("melaka_places").stream()
+COLLECTION = "melaka_places"
+
+# The crawler's place_id -> doc id record; the copy it writes to must be the one kept
+manifest = CrawlManifest(COLLECTION)
+
+# Only what grouping and picking the keeper need (no reviews)
+DEDUP_FIELDS = ["name", "place_id", "latitude", "longitude", "rating_count", "photos", "tags_suggested_by_ml"]
+
+# Same normalized name within this distance = same place
+DEFAULT_RADIUS_M = 150
+
+
+# === 🏆 Which copy to keep: the crawler's document, then richest data, doc id as tie-break ===
+def keep_score(entry):
+    doc_id, data = entry
+    place_id = data.get("place_id")
+    manifest_entry = manifest.get(place_id) if place_id else None
+    return (
+        # Deleting the copy the crawler writes to would only make the next crawl recreate it
+        bool(manifest_entry) and doc_id == manifest_entry["doc_id"],
+        bool(place_id) and doc_id == place_doc_id(place_id),
+        bool(place_id),
+        has_coordinates(data),
+        bool(data.get("tags_suggested_by_ml")),
+        len(data.get("photos") or []),
+        data.get("rating_count") or 0,
+        doc_id,
+    )
+
+
+def has_coordinates(data):
+    return isinstance(data.get("latitude"), (int, float)) and isinstance(data.get("longitude"), (int, float))
+
+
+def find_duplicate_groups(entries, radius_m=DEFAULT_RADIUS_M):
+    """
+    Group ``(doc_id, data)`` entries that describe the same place.
 
-    name_map = {}
+    Two entries are the same place when they share a ``place_id``, or when
+    their normalized names match and they lie within ``radius_m`` of each
+    other (candidates come from the same or a neighbouring geohash cell).
+    Entries without coordinates are matched on name alone. Returns groups
+    of two or more, best copy first.
+    """
+    parent = list(range(len(entries)))
 
-    # 🔄 Group documents by name
-    for doc in docs:
-        data = doc.to_dict()
-        name = data.get('name', '').strip()
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        parent[find(i)] = find(j)
+
+    # 1️⃣ Same place_id
+    by_place_id = {}
+    for i, (_, data) in enumerate(entries):
+        place_id = data.get("place_id")
+        if place_id:
+            if place_id in by_place_id:
+                union(i, by_place_id[place_id])
+            else:
+                by_place_id[place_id] = i
+
+    # 2️⃣ Same normalized name, close together (geohash buckets)
+    precision = precision_for_radius(radius_m)
+    buckets = defaultdict(list)
+    no_coords = {}
+    for i, (_, data) in enumerate(entries):
+        name = normalize_name(data.get("name"))
         if not name:
             continue
-        if name not in name_map:
-            name_map[name] = []
-        name_map[name].append((doc.id, data))
+        if has_coordinates(data):
+            buckets[(name, encode(data["latitude"], data["longitude"], precision))].append(i)
+        elif name in no_coords:
+            union(i, no_coords[name])
+        else:
+            no_coords[name] = i
+
+    for (name, cell), members in buckets.items():
+        for neighbor in neighbors(cell):
+            for j in buckets.get((name, neighbor), []):
+                for i in members:
+                    if i < j:
+                        a, b = entries[i][1], entries[j][1]
+                        if haversine_m(a["latitude"], a["longitude"], b["latitude"], b["longitude"]) <= radius_m:
+                            union(i, j)
+
+    groups = defaultdict(list)
+    for i, entry in enumerate(entries):
+        groups[find(i)].append(entry)
 
-    print("🧹 Processing duplicates...")
-    for name, entries in name_map.items():
-        if len(entries) <= 1:
-            continue  # not a duplicate
+    return [
+        sorted(group, key=keep_score, reverse=True)
+        for group in groups.values() if len(group) > 1
+    ]
 
-        # Just delete ONE of them (keep the first one)
-        to_delete = entries[1:]  # keep the first
 
-        for doc_id, _ in to_delete:
-            db.collection("melaka_places").document(doc_id).delete()
-            print(f"❌ Deleted duplicate for '{name}': {doc_id}")
+def clean_duplicate_places(dry_run=False, radius_m=DEFAULT_RADIUS_M):
+    print(f"🔍 Fetching documents from '{COLLECTION}'...")
+    docs = db.collection(COLLECTION).select(DEDUP_FIELDS).stream()
+    entries = [(doc.id, doc.to_dict()) for doc in docs]
+    print(f"📄 {len(entries)} documents loaded")
+
+    groups = find_duplicate_groups(entries, radius_m)
+    duplicates = sum(len(group) - 1 for group in groups)
+    print(f"🧹 {len(groups)} duplicate groups, {duplicates} documents to delete")
+
+    for group in groups:
+        keep_id, keep_data = group[0]
+        print(f"\n✅ Keep '{keep_data.get('name')}': {keep_id}")
+        for doc_id, data in group[1:]:
+            print(f"   ❌ {'Would delete' if dry_run else 'Delete'} '{data.get('name')}': {doc_id}")
+
+    if dry_run:
+        print("\n📝 Dry run: nothing was deleted.")
+        return
+
+    # Deletes go out in batched commits
+    with FirestoreWriter(db) as writer:
+        for group in groups:
+            for doc_id, _ in group[1:]:
+                writer.delete(db.collection(COLLECTION).document(doc_id))
 
     print("✅ Cleanup done.")
 
+
 if __name__ == "__main__":
-    clean_duplicate_places()
+    parser = argparse.ArgumentParser(description=f"Delete duplicate places from '{COLLECTION}'")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only report what would be deleted")
+    parser.add_argument("--radius", type=float, default=DEFAULT_RADIUS_M,
+                        help="Max distance in metres between same-name duplicates")
+    args = parser.parse_args()
+    clean_duplicate_places(dry_run=args.dry_run, radius_m=args.radius)
@@ -0,0 +1,168 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from google.api_core import exceptions as gexc
+
+# === 📦 Firestore allows at most 500 writes per batched commit ===
+MAX_BATCH_SIZE = 500
+
+# === ⚙️ Writer defaults ===
+DEFAULT_WORKERS = 4         # batches committed in parallel
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 0.5    # seconds, doubled on every retry
+
+# Errors caused by contention or load; anything else fails straight away
+RETRYABLE_ERRORS = (
+    gexc.Aborted,
+    gexc.DeadlineExceeded,
+    gexc.ServiceUnavailable,
+    gexc.ResourceExhausted,
+    gexc.InternalServerError,
+)
+
+
+class FirestoreWriter:
+    """
+    Buffers Firestore writes into batched commits of up to 500 operations.
+
+    Full batches are committed in parallel by ``workers`` threads. A batch
+    that fails with a contention or load error is retried with exponential
+    backoff and jitter. ``close()`` waits for everything in flight and
+    prints a throughput and failure summary. Use as a context manager:
+
+        with FirestoreWriter(db) as writer:
+            writer.set(db.collection('melaka_places').document(), data)
+    """
+
+    def __init__(self, db, batch_size=MAX_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                 max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_BASE_DELAY):
+        self.db = db
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # Keep at most two batches per worker queued so memory stays bounded
+        self._in_flight = threading.BoundedSemaphore(workers * 2)
+        self._futures = set()      # batches not committed yet; done ones are dropped
+        self._errors = []           # futures whose commit raised, re-raised by close()
+        self._pending = []
+        self._lock = threading.Lock()
+
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed = []
+        self._started = time.time()
+
+    # === ✍️ Queue operations ===
+    def set(self, doc_ref, data, merge=False, on_success=None):
+        self._queue(('set', doc_ref, data, merge, on_success))
+
+    def update(self, doc_ref, data, on_success=None):
+        self._queue(('update', doc_ref, data, None, on_success))
+
+    def delete(self, doc_ref, on_success=None):
+        self._queue(('delete', doc_ref, None, None, on_success))
+
+    # Same as collection.add(): new auto-id document, returned immediately
+    def add(self, collection_ref, data, on_success=None):
+        doc_ref = collection_ref.document()
+        self.set(doc_ref, data, on_success=on_success)
+        return doc_ref
+
+    def _queue(self, op):
+        with self._lock:
+            self._pending.append(op)
+            if len(self._pending) < self.batch_size:
+                return
+            ops, self._pending = self._pending, []
+        self._submit(ops)
+
+    # === 🚚 Send whatever is buffered ===
+    def flush(self):
+        with self._lock:
+            ops, self._pending = self._pending, []
+        if ops:
+            self._submit(ops)
+
+    def _submit(self, ops):
+        self._in_flight.acquire()
+        future = self._executor.submit(self._commit_with_retry, ops)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._on_done)
+
+    # A long crawl submits thousands of batches: only unfinished ones are kept
+    def _on_done(self, future):
+        self._in_flight.release()
+        with self._lock:
+            self._futures.discard(future)
+            if future.exception() is not None:
+                self._errors.append(future)
+
+    def _commit_with_retry(self, ops):
+        for attempt in range(self.max_retries + 1):
+            batch = self.db.batch()
+            for kind, doc_ref, data, merge, _ in ops:
+                if kind == 'set':
+                    batch.set(doc_ref, data, merge=merge)
+                elif kind == 'update':
+                    batch.update(doc_ref, data)
+                else:
+                    batch.delete(doc_ref)
+
+            try:
+                batch.commit()
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    self._record_failure(ops, e)
+                    return
+                with self._lock:
+                    self.retries += 1
+                delay = self.base_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                print(f"🔁 Batch of {len(ops)} hit {type(e).__name__}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+            except Exception as e:
+                self._record_failure(ops, e)
+                return
+
+        with self._lock:
+            self.written += len(ops)
+            self.batches += 1
+        for _, doc_ref, _, _, on_success in ops:
+            if on_success:
+                on_success(doc_ref)
+
+    def _record_failure(self, ops, error):
+        print(f"❌ Batch of {len(ops)} writes failed: {error}")
+        with self._lock:
+            self.failed.extend((doc_ref.path, str(error)) for _, doc_ref, _, _, _ in ops)
+
+    # === 🏁 Wait for every batch and report ===
+    def close(self):
+        self.flush()
+        with self._lock:
+            in_flight = list(self._futures)
+        for future in in_flight:
+            future.exception()  # wait; errors are raised below
+        self._executor.shutdown(wait=True)
+        for future in self._errors:
+            future.result()
+        print(self.summary())
+
+    def summary(self):
+        elapsed = max(time.time() - self._started, 1e-6)
+        return (f"📊 Firestore: {self.written} writes in {self.batches} batches, "
+                f"{elapsed:.1f}s ({self.written / elapsed:.0f} writes/s), "
+                f"{self.retries} retries, {len(self.failed)} failed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,124 @@
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+# === 📏 Smallest side of a geohash cell (metres, at the equator) per precision ===
+CELL_MIN_SIDE_M = {
+    1: 5000000, 2: 625000, 3: 156000, 4: 19500,
+    5: 4890, 6: 610, 7: 153, 8: 19, 9: 4.8,
+}
+
+
+# === #️⃣ Encode a coordinate into a geohash string ===
+def encode(lat, lng, precision=9):
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits, starting with longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+# === 📦 (south, west, north, east) of a geohash cell ===
+def decode_bbox(geohash):
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+
+    return lat_lo, lng_lo, lat_hi, lng_hi
+
+
+# === 🧭 The cell itself plus its 8 surrounding cells ===
+def neighbors(geohash):
+    south, west, north, east = decode_bbox(geohash)
+    lat = (south + north) / 2
+    lng = (west + east) / 2
+    dlat = north - south
+    dlng = east - west
+    precision = len(geohash)
+    return {
+        encode(lat + i * dlat, lng + j * dlng, precision)
+        for i in (-1, 0, 1) for j in (-1, 0, 1)
+    }
+
+
+# === 🎯 Finest precision whose cells are still at least radius_m across ===
+def precision_for_radius(radius_m):
+    fitting = [p for p, side in CELL_MIN_SIDE_M.items() if side >= radius_m]
+    return max(fitting) if fitting else 1
+
+
+# === 🗺️ Prefix fields written on every place document ===
+# 4 ≈ 20 km, 5 ≈ 5 km, 6 ≈ 1.2 km, 7 ≈ 150 m cells
+GEOHASH_PRECISIONS = (4, 5, 6, 7)
+GEOHASH_FIELD = 'geohash'
+
+
+def prefix_field(precision):
+    return f'{GEOHASH_FIELD}_{precision}'
+
+
+def geohash_fields(lat, lng, precisions=GEOHASH_PRECISIONS):
+    """
+    Geohash fields for one place: the full ``geohash`` (precision 9) plus a
+    ``geohash_<p>`` prefix per precision. Equality on a prefix field finds
+    every place in that cell; ``{}`` when the coordinates are missing.
+    """
+    if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+        return {}
+    full = encode(lat, lng, 9)
+    fields = {GEOHASH_FIELD: full}
+    for p in precisions:
+        fields[prefix_field(p)] = full[:p]
+    return fields
+
+
+# === 📡 Field + cells covering radius_m around a point (fits one 'in' query) ===
+def query_cells(lat, lng, radius_m, precisions=GEOHASH_PRECISIONS):
+    precision = min(max(precisions), precision_for_radius(radius_m))
+    precision = max(precision, min(precisions))
+    return prefix_field(precision), sorted(neighbors(encode(lat, lng, precision)))
@@ -0,0 +1,37 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# === 🔌 CONNECTION POOL SIZING ===
+# One pool per host; each pool keeps up to POOL_MAXSIZE keep-alive sockets
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 32
+DEFAULT_TIMEOUT = 30  # seconds
+
+_session = None
+_session_lock = threading.Lock()
+
+
+# === 🧵 Build a keep-alive session with a sized connection pool ===
+def build_session(pool_maxsize=POOL_MAXSIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# === ♻️ Process-wide shared session (created once, reused by every scraper) ===
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+# === 📥 GET through the shared pool ===
+def http_get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return get_session().get(url, params=params, timeout=timeout, **kwargs)
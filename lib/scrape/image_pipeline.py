@@ -0,0 +1,209 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+from http_pool import http_get
+
+# === ⚙️ Pipeline defaults ===
+DEFAULT_WORKERS = 8
+DEFAULT_PREFIX = 'place_images'
+
+# === 📐 Sized variants (name -> max width in px) ===
+THUMB = 'thumb'
+DETAIL = 'detail'
+ORIGINAL = 'original'
+DEFAULT_VARIANTS = {
+    THUMB: 320,     # list cards, map markers
+    DETAIL: 800,    # place detail gallery
+}
+
+# Ask Google for just enough pixels to build the largest variant
+SOURCE_MAXWIDTH = max(DEFAULT_VARIANTS.values())
+
+# === 🎛️ Encoder settings per output format ===
+ENCODERS = {
+    'webp': {'ext': 'webp', 'content_type': 'image/webp',
+             'options': {'format': 'WEBP', 'quality': 75, 'method': 6}},
+    'jpeg': {'ext': 'jpg', 'content_type': 'image/jpeg',
+             'options': {'format': 'JPEG', 'quality': 80, 'optimize': True, 'progressive': True}},
+}
+DEFAULT_FORMAT = 'webp'
+
+# === 🏷️ Stored originals keep their own format (PIL format -> ext, content type) ===
+ORIGINAL_TYPES = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'PNG': ('png', 'image/png'),
+    'WEBP': ('webp', 'image/webp'),
+    'GIF': ('gif', 'image/gif'),
+}
+
+
+# === 📥 Plain pooled download, used when no fetcher is given ===
+def fetch_url(url):
+    response = http_get(url)
+    response.raise_for_status()
+    return response.content
+
+
+# Only the header is read; anything PIL does not recognise is stored as JPEG, as before
+def original_type(content):
+    try:
+        image_format = Image.open(BytesIO(content)).format
+    except OSError:
+        image_format = None
+    return ORIGINAL_TYPES.get(image_format, ORIGINAL_TYPES['JPEG'])
+
+
+# === 🖼️ Resize (never upscale) and re-encode one variant ===
+def encode_variant(image, max_width, image_format=DEFAULT_FORMAT):
+    variant = image.copy()
+    if variant.width > max_width:
+        height = round(variant.height * max_width / variant.width)
+        variant = variant.resize((max_width, height), Image.LANCZOS)
+
+    # Saving without exif/icc arguments strips all metadata
+    buffer = BytesIO()
+    variant.save(buffer, **ENCODERS[image_format]['options'])
+    return buffer.getvalue()
+
+
+class ImagePipeline:
+    """
+    Thread-pooled download -> resize/encode -> upload stage for Firebase Storage.
+
+    Every photo is stored as a small set of sized variants
+    (``<prefix>/<sha256>_<variant>.<ext>``), named by the SHA-256 of the
+    downloaded image, so the same photo is only ever stored once. Names
+    already in the bucket are listed once up front and skipped, which makes
+    reruns almost free. Uploads are made public in the same request via
+    ``predefined_acl`` instead of a separate ``make_public()``. A photo
+    shared by several places is uploaded by one of them while the others
+    wait for it, so nobody gets URLs of blobs that never landed.
+
+    With ``variants=None`` the downloaded bytes are stored untouched as a
+    single ``original`` blob, named and typed after their real format.
+    """
+
+    def __init__(self, bucket, fetch=fetch_url, workers=DEFAULT_WORKERS, prefix=DEFAULT_PREFIX,
+                 variants=DEFAULT_VARIANTS, image_format=DEFAULT_FORMAT):
+        self.bucket = bucket
+        self.fetch = fetch
+        self.prefix = prefix
+        self.variants = variants
+        self.image_format = image_format
+        self.workers = workers
+
+        self.uploaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_uploaded = 0
+        self._known = None
+        self._claims = {}   # digest -> Event set when its upload ends, either way
+        self._lock = threading.Lock()
+        # One pool for every call, so a stage calling per place does not start threads each time
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    # === 📚 Existing blob names, listed once per run ===
+    def _known_blobs(self):
+        if self._known is None:
+            self._known = {blob.name for blob in self.bucket.list_blobs(prefix=f"{self.prefix}/")}
+        return self._known
+
+    def public_url(self, blob_name):
+        return f"https://storage.googleapis.com/{self.bucket.name}/{blob_name}"
+
+    def _blob_names(self, digest, content):
+        if self.variants is None:
+            ext, _ = original_type(content)
+            return {ORIGINAL: f"{self.prefix}/{digest}.{ext}"}
+        ext = ENCODERS[self.image_format]['ext']
+        return {name: f"{self.prefix}/{digest}_{name}.{ext}" for name in self.variants}
+
+    def _encode_all(self, content):
+        if self.variants is None:
+            _, content_type = original_type(content)
+            return {ORIGINAL: (content, content_type)}
+        image = Image.open(BytesIO(content)).convert('RGB')
+        content_type = ENCODERS[self.image_format]['content_type']
+        return {
+            name: (encode_variant(image, width, self.image_format), content_type)
+            for name, width in self.variants.items()
+        }
+
+    # === 🔁 One image: download, hash, skip or encode + upload; returns {variant: url} ===
+    def process(self, url):
+        try:
+            content = self.fetch(url)
+            digest = hashlib.sha256(content).hexdigest()
+            blob_names = self._blob_names(digest, content)
+
+            while True:
+                with self._lock:
+                    known = self._known_blobs()
+                    missing = [n for n in blob_names.values() if n not in known]
+                    claim = self._claims.get(digest) if missing else None
+                    if missing and claim is None:
+                        # Claim the image so parallel duplicates upload it only once
+                        claim = self._claims[digest] = threading.Event()
+                        break
+                if claim is None:
+                    with self._lock:
+                        self.skipped += 1
+                    return {name: self.public_url(blob) for name, blob in blob_names.items()}
+                # Another place is uploading the same image: its URLs are only valid once
+                # that upload lands; if it fails the claim is gone and this one retries
+                claim.wait()
+
+            try:
+                self._upload(content, blob_names, missing)
+                with self._lock:
+                    known.update(missing)
+                    self.uploaded += 1
+            finally:
+                with self._lock:
+                    del self._claims[digest]
+                claim.set()
+            return {name: self.public_url(blob) for name, blob in blob_names.items()}
+
+        except Exception as e:
+            print(f"❌ Error uploading image {url[:80]}: {e}")
+            with self._lock:
+                self.failed += 1
+            return None
+
+    def _upload(self, content, blob_names, missing):
+        encoded = self._encode_all(content)
+        for name, blob_name in blob_names.items():
+            if blob_name not in missing:
+                continue
+            data, content_type = encoded[name]
+            self.bucket.blob(blob_name).upload_from_string(
+                data, content_type=content_type, predefined_acl='publicRead'
+            )
+            with self._lock:
+                self.bytes_uploaded += len(data)
+
+    # === 📦 Many places at once; keeps input order, drops failures ===
+    def upload_groups(self, url_groups):
+        flat = [url for group in url_groups for url in group]
+        results = list(self._executor.map(self.process, flat))
+
+        grouped = []
+        index = 0
+        for group in url_groups:
+            grouped.append([u for u in results[index:index + len(group)] if u])
+            index += len(group)
+        return grouped
+
+    def upload_all(self, urls):
+        return self.upload_groups([urls])[0]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def summary(self):
+        return (f"🖼️ Images: {self.uploaded} uploaded ({self.bytes_uploaded / 1024:.0f} KB), "
+                f"{self.skipped} already stored, {self.failed} failed")
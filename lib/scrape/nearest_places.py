@@ -0,0 +1,98 @@
+import numpy as np
+
+from firestore_writer import FirestoreWriter
+from tiling import EARTH_RADIUS_M
+
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:  # scikit-learn is optional; numpy brute force is exact too
+    BallTree = None
+
+# === ⚙️ Nearest-neighbour table defaults ===
+DEFAULT_K = 10              # related places stored per document
+NEARBY_FIELD = 'nearby'
+BRUTE_FORCE_CHUNK = 1024    # rows of the distance matrix computed at a time
+
+NEARBY_SOURCE_FIELDS = ['name', 'latitude', 'longitude', NEARBY_FIELD]
+
+
+# === 📏 Pairwise haversine distances (metres) between two sets of radians ===
+def _haversine_matrix(a, b):
+    dlat = b[None, :, 0] - a[:, None, 0]
+    dlng = b[None, :, 1] - a[:, None, 1]
+    h = np.sin(dlat / 2) ** 2 + np.cos(a[:, None, 0]) * np.cos(b[None, :, 0]) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _brute_force(points, k):
+    indices = np.empty((len(points), k), dtype=np.int64)
+    distances = np.empty((len(points), k))
+    for start in range(0, len(points), BRUTE_FORCE_CHUNK):
+        block = _haversine_matrix(points[start:start + BRUTE_FORCE_CHUNK], points)
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest_d = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_d, axis=1, kind='stable')
+        indices[start:start + len(block)] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:start + len(block)] = np.take_along_axis(nearest_d, order, axis=1)
+    return indices, distances
+
+
+# === 🌳 k nearest places for every place: (indices, distances in metres) ===
+def nearest_neighbors(coords, k=DEFAULT_K):
+    """
+    ``coords`` is a sequence of ``(lat, lng)`` in degrees. Returns two
+    ``(n, k')`` arrays, nearest first, where ``k' = min(k, n - 1)`` and
+    each place itself is excluded. Uses a haversine ``BallTree`` when
+    scikit-learn is installed, otherwise a chunked numpy brute force.
+    """
+    points = np.radians(np.asarray(coords, dtype=float).reshape(-1, 2))
+    k = min(k, len(points) - 1)
+    if k <= 0:
+        return np.empty((len(points), 0), dtype=np.int64), np.empty((len(points), 0))
+
+    if BallTree is not None:
+        tree = BallTree(points, metric='haversine')
+        distances, indices = tree.query(points, k=k + 1)
+        distances = distances * EARTH_RADIUS_M
+    else:
+        indices, distances = _brute_force(points, k + 1)
+
+    # Drop each place's own entry (the first hit, or a twin at distance 0)
+    rows = np.arange(len(points))[:, None]
+    keep = indices != rows
+    keep[keep.sum(axis=1) > k, -1] = False
+    return indices[keep].reshape(-1, k), distances[keep].reshape(-1, k)
+
+
+# === 📋 {doc_id: [{id, name, distance_m}, ...]} for (doc_id, data) entries ===
+def build_nearby_table(entries, k=DEFAULT_K):
+    located = [
+        (doc_id, data) for doc_id, data in entries
+        if isinstance(data.get('latitude'), (int, float)) and isinstance(data.get('longitude'), (int, float))
+    ]
+    indices, distances = nearest_neighbors([(d['latitude'], d['longitude']) for _, d in located], k)
+
+    table = {}
+    for (doc_id, _), row, row_d in zip(located, indices, distances):
+        table[doc_id] = [
+            {'id': located[j][0], 'name': located[j][1].get('name'), 'distance_m': int(round(d))}
+            for j, d in zip(row.tolist(), row_d.tolist())
+        ]
+    return table
+
+
+# === ⬆️ Recompute the table for a collection and write only what changed ===
+def refresh_nearby(db, collection='melaka_places', k=DEFAULT_K):
+    entries = [
+        (doc.id, doc.to_dict())
+        for doc in db.collection(collection).select(NEARBY_SOURCE_FIELDS).stream()
+    ]
+    table = build_nearby_table(entries, k)
+    stored = {doc_id: data.get(NEARBY_FIELD) for doc_id, data in entries}
+
+    changed = [doc_id for doc_id, nearby in table.items() if stored.get(doc_id) != nearby]
+    with FirestoreWriter(db) as writer:
+        for doc_id in changed:
+            writer.update(db.collection(collection).document(doc_id), {NEARBY_FIELD: table[doc_id]})
+
+    print(f"🧭 Nearby table for '{collection}': {len(table)} places, {len(changed)} updated (k={k})")
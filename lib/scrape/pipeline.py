@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+
+# === ⚙️ Pipeline defaults ===
+DEFAULT_QUEUE_SIZE = 64     # items buffered between two stages
+DEFAULT_LINGER = 1.0        # seconds a partial batch may wait for more items
+POLL_INTERVAL = 0.2         # how often blocked threads check for a failure
+
+_DONE = object()
+
+
+class PipelineError(RuntimeError):
+    """A stage raised; the pipeline stopped and re-raises it from ``run``."""
+
+
+class _Stage:
+    def __init__(self, name, fn, workers, batch_size, linger):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.linger = linger
+        self.inbox = None
+        self.active = workers
+        self.received = 0
+        self.emitted = 0
+        self.lock = threading.Lock()
+
+
+class Pipeline:
+    """
+    A source and a chain of stages joined by bounded queues.
+
+    ``source(emit)`` produces items by calling ``emit(item)``. Each stage
+    runs ``fn(item, emit)`` (or ``fn(items, emit)`` for batch stages) on
+    its own worker threads and may emit zero or more items downstream.
+    Every queue holds at most ``maxsize`` items, so a slow stage blocks the
+    ones before it instead of letting memory grow. If any stage raises,
+    all threads stop and ``run`` raises ``PipelineError``; work already
+    done by later stages (e.g. committed writes) is kept.
+
+        pipeline = Pipeline(crawl)
+        pipeline.stage('details', fetch_details, workers=8)
+        pipeline.stage('write', write_place)
+        pipeline.run()
+    """
+
+    def __init__(self, source, maxsize=DEFAULT_QUEUE_SIZE):
+        self.source = source
+        self.maxsize = maxsize
+        self.stages = []
+        self.produced = 0
+        self._stop = threading.Event()
+        self._error = None
+
+    def stage(self, name, fn, workers=1):
+        self.stages.append(_Stage(name, fn, workers, None, None))
+        return self
+
+    # === 📦 fn gets lists of up to `size` items (partial after `linger` s idle) ===
+    def batch_stage(self, name, fn, size, workers=1, linger=DEFAULT_LINGER):
+        self.stages.append(_Stage(name, fn, workers, size, linger))
+        return self
+
+    def _put(self, inbox, item):
+        while not self._stop.is_set():
+            try:
+                inbox.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+        raise PipelineError("pipeline stopped")
+
+    def _fail(self, name, error):
+        if self._error is None:
+            self._error = (name, error)
+        self._stop.set()
+
+    def _emitter(self, index):
+        if index + 1 < len(self.stages):
+            nxt = self.stages[index + 1]
+            return lambda item: self._put(nxt.inbox, item)
+        return lambda item: None
+
+    def _finish(self, index):
+        """Last worker of a stage out signals every worker of the next stage."""
+        if index + 1 < len(self.stages):
+            nxt = self.stages[index + 1]
+            for _ in range(nxt.workers):
+                self._put(nxt.inbox, _DONE)
+
+    def _run_source(self):
+        first = self.stages[0]
+
+        def emit(item):
+            self.produced += 1
+            self._put(first.inbox, item)
+
+        try:
+            self.source(emit)
+            for _ in range(first.workers):
+                self._put(first.inbox, _DONE)
+        except Exception as e:
+            self._fail('source', e)
+
+    def _run_worker(self, index):
+        stage = self.stages[index]
+        downstream = self._emitter(index)
+
+        def emit(item):
+            with stage.lock:
+                stage.emitted += 1
+            downstream(item)
+
+        batch, batch_started = [], None
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = stage.inbox.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # ⏳ Don't let a partial batch wait on a slow upstream forever
+                    if batch and time.monotonic() - batch_started >= stage.linger:
+                        stage.fn(batch, emit)
+                        batch = []
+                    continue
+
+                if item is _DONE:
+                    if batch:
+                        stage.fn(batch, emit)
+                    with stage.lock:
+                        stage.active -= 1
+                        last = stage.active == 0
+                    if last:
+                        self._finish(index)
+                    return
+
+                with stage.lock:
+                    stage.received += 1
+                if stage.batch_size is None:
+                    stage.fn(item, emit)
+                    continue
+
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(item)
+                if len(batch) >= stage.batch_size:
+                    stage.fn(batch, emit)
+                    batch = []
+        except Exception as e:
+            self._fail(stage.name, e)
+
+    # === ▶️ Run to completion; raises PipelineError if any stage failed ===
+    def run(self):
+        started = time.time()
+        for stage in self.stages:
+            stage.inbox = queue.Queue(maxsize=self.maxsize)
+
+        threads = [threading.Thread(target=self._run_source, name='source', daemon=True)]
+        for i, stage in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(target=self._run_worker, args=(i,), name=f'{stage.name}-{w}', daemon=True)
+                for w in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(self.summary(time.time() - started))
+        if self._error is not None:
+            name, error = self._error
+            raise PipelineError(f"stage '{name}' failed: {error}") from error
+
+    def summary(self, elapsed):
+        stages = ', '.join(f"{s.name} {s.received}->{s.emitted}" for s in self.stages)
+        return f"🚰 Pipeline: {self.produced} in, {stages} ({elapsed:.1f}s)"
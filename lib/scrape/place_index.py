@@ -0,0 +1,60 @@
+import re
+import threading
+
+# === 🧼 Name normalization: case, punctuation and spacing don't matter ===
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_name(name):
+    return _NON_ALNUM.sub(' ', (name or '').casefold()).strip()
+
+
+class PlaceIndex:
+    """
+    In-memory index of a Firestore place collection, keyed by ``place_id``
+    and by normalized name.
+
+    ``load`` streams the collection once with a projection, so only the
+    ``name`` and ``place_id`` fields cross the wire. After that every
+    "is this place already stored?" check is an O(1) dict lookup instead
+    of a Firestore query. The index is a snapshot of the collection as
+    it was before the run: places written during the run are tracked by
+    the crawl's manifest and claims, not added here.
+    """
+
+    def __init__(self):
+        self.by_place_id = {}
+        self.by_name = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db, collection='melaka_places'):
+        index = cls()
+        for doc in db.collection(collection).select(['name', 'place_id']).stream():
+            data = doc.to_dict()
+            index.add(data.get('place_id'), data.get('name'), doc.id)
+        print(f"📇 Indexed {len(index.by_name)} names / {len(index.by_place_id)} place_ids from '{collection}'")
+        return index
+
+    def add(self, place_id, name, doc_id=None):
+        with self._lock:
+            if place_id:
+                self.by_place_id[place_id] = doc_id
+            key = normalize_name(name)
+            if key:
+                self.by_name[key] = doc_id
+
+    # === 🔎 Known by place_id or by (normalized) name ===
+    def contains(self, place_id=None, name=None):
+        if place_id and place_id in self.by_place_id:
+            return True
+        key = normalize_name(name)
+        return bool(key) and key in self.by_name
+
+    def doc_id_for(self, place_id=None, name=None):
+        if place_id and place_id in self.by_place_id:
+            return self.by_place_id[place_id]
+        return self.by_name.get(normalize_name(name))
+
+    def __len__(self):
+        return len(self.by_name)
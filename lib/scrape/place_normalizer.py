@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from tiling import MELAKA_BOUNDS
+
+# === 🧠 Narrower types mapped to broader categories (shared by every scraper) ===
+TYPE_MAPPING = {
+    'bay': 'beach',
+    'public_beach': 'beach',
+    'campground': 'camping_ground',
+    'camping_site': 'camping_ground',
+    'shopping_mall': 'shopping_malls',
+    'gift_shop': 'shopping_malls',
+    'coffee_shop': 'cafe',
+}
+
+# === 📍 Addresses that count as Melaka when a place has no usable coordinates ===
+MELAKA_KEYWORDS = ['melaka', 'malacca']
+
+# Columns every search record carries into the frame
+RECORD_COLUMNS = ['place_id', 'name', 'address', 'rating', 'latitude', 'longitude', 'types', 'searched_type']
+
+
+class SeenPlaces:
+    """place_ids emitted by earlier batches of one crawl."""
+
+    def __init__(self):
+        self.place_ids = set()
+
+
+# === 🔁 Raw stream_tiles hits -> flat search records ===
+def search_records(results, labels=None):
+    """
+    ``results`` are ``(query_index, place)`` pairs from ``stream_tiles``;
+    ``labels[query_index]`` becomes the record's ``searched_type``.
+    """
+    records = []
+    for query_index, place in results:
+        location = place.get('geometry', {}).get('location', {})
+        records.append({
+            'place_id': place.get('place_id'),
+            'name': place.get('name'),
+            'address': place.get('vicinity'),
+            'rating': place.get('rating'),
+            'latitude': location.get('lat'),
+            'longitude': location.get('lng'),
+            'types': place.get('types') or [],
+            'searched_type': labels[query_index] if labels else None,
+        })
+    return records
+
+
+def _contains_any(series, keywords):
+    pattern = '|'.join(keywords)
+    return series.fillna('').str.casefold().str.contains(pattern, regex=True)
+
+
+# === 🧼 Validate, filter and dedup a whole crawl at once ===
+def normalize_places(records, bounds=MELAKA_BOUNDS, keywords=MELAKA_KEYWORDS, type_mapping=TYPE_MAPPING,
+                     seen=None, report=True):
+    """
+    Clean search records column-wise and return the survivors as dicts,
+    in input order.
+
+    - ``searched_type`` goes through ``type_mapping``
+    - names are stripped; a missing name or a rating outside (0, 5] drops
+      the record
+    - coordinates must be numeric and inside ``bounds``; a record without
+      usable coordinates is kept only if its address mentions one of
+      ``keywords`` (its coordinates are then ``None``)
+    - duplicates by ``place_id`` keep the first; names are not compared,
+      since branches share names and non-Latin names do not normalize
+
+    Pass the same ``SeenPlaces`` for every batch of a streamed crawl so
+    duplicates across batches are dropped too.
+    """
+    df = pd.DataFrame.from_records(records, columns=RECORD_COLUMNS) if records else pd.DataFrame(columns=RECORD_COLUMNS)
+    total = len(df)
+
+    df['searched_type'] = df['searched_type'].replace(type_mapping)
+    df['name'] = df['name'].astype('string').str.strip()
+    rating = pd.to_numeric(df['rating'], errors='coerce')
+    lat = pd.to_numeric(df['latitude'], errors='coerce')
+    lng = pd.to_numeric(df['longitude'], errors='coerce')
+
+    valid = df['name'].fillna('').ne('') & rating.gt(0) & rating.le(5)
+    invalid = total - int(valid.sum())
+
+    south, west, north, east = bounds
+    has_coords = lat.notna() & lng.notna()
+    in_bounds = has_coords & lat.between(south, north) & lng.between(west, east)
+    located = in_bounds | (~has_coords & _contains_any(df['address'], keywords))
+    outside = int((valid & ~located).sum())
+
+    # Original values are kept; only rejected coordinates are cleared
+    df['latitude'] = df['latitude'].where(in_bounds)
+    df['longitude'] = df['longitude'].where(in_bounds)
+    df = df[valid & located]
+
+    # Same place_id = same place
+    dup_id = df['place_id'].notna() & df['place_id'].duplicated()
+    if seen is not None:
+        dup_id |= df['place_id'].isin(seen.place_ids)
+    duplicates = int(dup_id.sum())
+    df = df[~dup_id]
+    if seen is not None:
+        seen.place_ids.update(df['place_id'].dropna())
+
+    if report:
+        print(f"🧼 Normalized {total} candidates -> {len(df)} "
+              f"({invalid} invalid, {outside} outside Melaka, {duplicates} duplicates)")
+
+    df = df.astype(object).replace({np.nan: None, pd.NA: None})
+    return df.to_dict('records')
@@ -0,0 +1,73 @@
+import threading
+from collections import Counter
+
+# === 💵 Places API (legacy) billing SKUs ===
+NEARBY_SEARCH_SKU = 'Nearby Search'
+TEXT_SEARCH_SKU = 'Text Search'
+DETAILS_SKU = 'Place Details'
+CONTACT_SKU = 'Contact Data'
+ATMOSPHERE_SKU = 'Atmosphere Data'
+PHOTO_SKU = 'Places Photo'
+
+# USD per 1000 calls, first volume tier; check the billing console for your contract
+SKU_PRICES = {
+    NEARBY_SEARCH_SKU: 32.00,
+    TEXT_SEARCH_SKU: 32.00,
+    DETAILS_SKU: 17.00,
+    CONTACT_SKU: 3.00,
+    ATMOSPHERE_SKU: 5.00,
+    PHOTO_SKU: 7.00,
+}
+
+# === 🎭 Details fields that add a data SKU on top of Place Details (Basic Data is free) ===
+CONTACT_FIELDS = {
+    'opening_hours', 'current_opening_hours', 'secondary_opening_hours',
+    'formatted_phone_number', 'international_phone_number', 'website',
+}
+ATMOSPHERE_FIELDS = {
+    'review', 'reviews', 'rating', 'user_ratings_total', 'price_level', 'editorial_summary',
+    'curbside_pickup', 'delivery', 'dine_in', 'takeout', 'reservable',
+    'serves_beer', 'serves_breakfast', 'serves_brunch', 'serves_dinner', 'serves_lunch',
+    'serves_vegetarian_food', 'serves_wine',
+}
+
+
+# === 🧾 SKUs one successful request is billed under ===
+def skus_for(endpoint, params):
+    if endpoint == 'details':
+        fields = set((params.get('fields') or '').split(','))
+        skus = [DETAILS_SKU]
+        if not params.get('fields') or fields & CONTACT_FIELDS:
+            skus.append(CONTACT_SKU)
+        if not params.get('fields') or fields & ATMOSPHERE_FIELDS:
+            skus.append(ATMOSPHERE_SKU)
+        return skus
+    # Searches return every field, so they carry both data SKUs
+    if endpoint == 'nearbysearch':
+        return [NEARBY_SEARCH_SKU, CONTACT_SKU, ATMOSPHERE_SKU]
+    if endpoint == 'textsearch':
+        return [TEXT_SEARCH_SKU, CONTACT_SKU, ATMOSPHERE_SKU]
+    if endpoint == 'photo':
+        return [PHOTO_SKU]
+    return []
+
+
+class PlacesBilling:
+    """Billable calls per SKU for one run (cache hits and failed requests are free)."""
+
+    def __init__(self, prices=None):
+        self.prices = {**SKU_PRICES, **(prices or {})}
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, params):
+        with self._lock:
+            self.calls.update(skus_for(endpoint, params))
+
+    def cost(self, sku=None):
+        skus = [sku] if sku else list(self.calls)
+        return sum(self.calls[s] * self.prices.get(s, 0) / 1000 for s in skus)
+
+    def summary(self):
+        lines = [f"   {sku}: {n} calls, ~${self.cost(sku):.2f}" for sku, n in self.calls.most_common()]
+        return "\n".join([f"💵 Estimated Places cost: ~${self.cost():.2f}"] + lines)
@@ -0,0 +1,365 @@
+import asyncio
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from http_pool import get_session, DEFAULT_TIMEOUT
+from places_billing import PlacesBilling
+from rate_limiter import RateLimiter
+from response_cache import make_url_key
+
+# === 🌐 GOOGLE PLACES WEB SERVICE ENDPOINTS ===
+PLACES_BASE_URL = 'https://maps.googleapis.com/maps/api/place'
+NEARBY_SEARCH = 'nearbysearch'
+TEXT_SEARCH = 'textsearch'
+DETAILS = 'details'
+PHOTO = 'photo'
+
+# === 💾 Only successful answers are worth replaying ===
+CACHEABLE_STATUSES = {'OK', 'ZERO_RESULTS'}
+
+# === 📋 Details field masks, smallest per stage ===
+DETAILS_FIELDS = 'review,user_ratings_total,opening_hours,photos'   # new document, photos included
+REFRESH_FIELDS = 'review,user_ratings_total,opening_hours'          # existing document keeps its photos
+REVIEW_FIELDS = 'review'                                            # review text only (ML tagging)
+STAGE_MASKS = (DETAILS_FIELDS, REFRESH_FIELDS, REVIEW_FIELDS)
+
+# Mask field -> key it fills in the details result
+RESULT_KEYS = {'review': 'reviews', 'photo': 'photos'}
+
+# === ⚙️ How many details requests may be in flight at once ===
+DEFAULT_MAX_CONCURRENCY = 8
+
+# === 🧠 Places whose details stay in memory, about a streamed crawl's in-flight window ===
+DEFAULT_DETAILS_MEMO = 512
+
+# === 🚫 Details answers that mean the place itself is gone, not that the request failed ===
+GONE_STATUSES = {'NOT_FOUND', 'ZERO_RESULTS'}
+
+# === 🔁 Retries: statuses and HTTP codes that mean "try again later" ===
+OVER_QUERY_LIMIT = 'OVER_QUERY_LIMIT'
+RETRYABLE_STATUSES = {OVER_QUERY_LIMIT, 'UNKNOWN_ERROR'}
+THROTTLED_HTTP = 429
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BASE_DELAY = 1.0    # seconds, doubled on every retry
+MAX_RETRY_DELAY = 30
+
+# === ⏳ A new next_page_token needs ~2s before Google accepts it ===
+PAGE_TOKEN_FIRST_POLL = 1.0     # seconds after the token arrived
+PAGE_TOKEN_POLL = 0.5           # between polls while it is still INVALID_REQUEST
+PAGE_TOKEN_TIMEOUT = 10         # still invalid after this long: give up on the page
+
+
+class PlacesApiError(Exception):
+    """A request still failed (quota, 5xx, timeout) after every retry, or was refused."""
+
+
+class PlaceGone(PlacesApiError):
+    """The place_id no longer resolves (closed or removed): retrying will not help."""
+
+
+class PlacesClient:
+    """
+    Shared Google Places client.
+
+    All requests go through one pooled keep-alive session, and
+    ``get_details_for_page`` fans out the details lookups for a whole
+    batch of places at the same time through asyncio, bounded by
+    ``max_concurrency``. When a ``ResponseCache`` is given, JSON responses
+    and photos are served from it first.
+
+    Every request that reaches the network first takes a token from the
+    shared ``RateLimiter``. ``OVER_QUERY_LIMIT``, ``UNKNOWN_ERROR``, HTTP
+    429/5xx and timeouts are retried with exponential backoff and jitter;
+    a request that fails every retry raises ``PlacesApiError``.
+
+    Details of the last ``details_memo`` places are kept (least recently
+    used first out), so asking again for a place still in flight (from
+    another stage or profile) only requests the fields not fetched yet,
+    while memory stays flat over a long crawl. Billable calls are tallied
+    per SKU in ``billing``.
+    """
+
+    def __init__(self, api_key, max_concurrency=DEFAULT_MAX_CONCURRENCY, session=None, cache=None,
+                 limiter=None, max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_BASE_DELAY,
+                 details_memo=DEFAULT_DETAILS_MEMO):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.session = session or get_session()
+        self.cache = cache
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._lock = threading.Lock()
+        self._details = OrderedDict()   # place_id -> (fields fetched, merged raw result), LRU
+        self.details_memo = details_memo
+        self._details_in_flight = {}
+        self.billing = PlacesBilling()
+        self.requests = 0
+        self.retries = 0
+        self.failed = 0
+
+    # === 🔁 Rate-limited GET, retried while the failure is temporary ===
+    def _request(self, label, url, params=None, decode=False):
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = min(self.base_delay * 2 ** (attempt - 1), MAX_RETRY_DELAY) * random.uniform(0.5, 1.5)
+                with self._lock:
+                    self.retries += 1
+                print(f"🔁 {label} hit {error}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+            self.limiter.acquire()
+            with self._lock:
+                self.requests += 1
+            try:
+                response = self.session.get(url, params=params, timeout=DEFAULT_TIMEOUT)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                error = type(e).__name__
+                continue
+
+            if response.status_code == THROTTLED_HTTP or response.status_code >= 500:
+                if response.status_code == THROTTLED_HTTP:
+                    self.limiter.throttled()
+                error = f"HTTP {response.status_code}"
+                continue
+            if not response.ok:
+                # 4xx other than 429: retrying will not help
+                with self._lock:
+                    self.failed += 1
+                response.raise_for_status()
+            if not decode:
+                self.limiter.succeeded()
+                return response
+
+            data = response.json()
+            status = data.get('status')
+            if status in RETRYABLE_STATUSES:
+                if status == OVER_QUERY_LIMIT:
+                    self.limiter.throttled()
+                error = status
+                continue
+            self.limiter.succeeded()
+            return data
+
+        with self._lock:
+            self.failed += 1
+        raise PlacesApiError(f"{label} failed after {self.max_retries + 1} attempts: {error}")
+
+    # === 📡 Raw GET against a Places endpoint, returns decoded JSON ===
+    def get(self, endpoint, params):
+        if self.cache is not None:
+            data = self.cache.get_json(endpoint, params)
+            if data is not None:
+                return data
+
+        url = f"{PLACES_BASE_URL}/{endpoint}/json"
+        data = self._request(endpoint, url, {**params, 'key': self.api_key}, decode=True)
+
+        if data.get('status') in CACHEABLE_STATUSES:
+            self.billing.record(endpoint, params)
+            if self.cache is not None:
+                self.cache.put_json(endpoint, params, data)
+        return data
+
+    # === 🔗 Google Place Photo URL from its photo_reference ===
+    def photo_url(self, photo_reference, maxwidth=400):
+        return f"{PLACES_BASE_URL}/{PHOTO}?maxwidth={maxwidth}&photoreference={photo_reference}&key={self.api_key}"
+
+    # === 📥 Download any URL (photos, etc.) through the pooled session ===
+    def download(self, url):
+        # Places photos are billed like any other call, so cache them too
+        key = None
+        if self.cache is not None and url.startswith(f"{PLACES_BASE_URL}/{PHOTO}"):
+            key = make_url_key(PHOTO, url)
+            content = self.cache.get_bytes(PHOTO, key)
+            if content is not None:
+                return content
+
+        if key is not None:
+            response = self._request(PHOTO, url)
+            self.billing.record(PHOTO, {})
+        else:
+            response = self.session.get(url, timeout=DEFAULT_TIMEOUT)
+            response.raise_for_status()
+
+        if key is not None:
+            self.cache.put_bytes(PHOTO, key, response.content)
+        return response.content
+
+    # === 🔍 Yield every result page of a nearby search (follows next_page_token) ===
+    def nearby_search_pages(self, location, radius, place_type=None, keyword=None, page_token=None):
+        params = {
+            'location': f"{location[0]},{location[1]}",
+            'radius': radius,
+        }
+        if place_type:
+            params['type'] = place_type
+        if keyword:
+            params['keyword'] = keyword
+        # Resuming a half-crawled search: continue from its saved page token
+        if page_token:
+            params = {'pagetoken': page_token}
+
+        # PlacesApiError / HTTPError propagate: a failed page must not pass for a short, finished tile
+        token_at = None
+        while True:
+            data = self.get(NEARBY_SEARCH, params) if token_at is None else self.next_page(params, token_at)
+            yield data
+
+            next_token = data.get('next_page_token')
+            if not next_token:
+                return
+            params = {'pagetoken': next_token}
+            token_at = time.monotonic()
+
+    # === ⏳ Poll a fresh page token until Google stops answering INVALID_REQUEST ===
+    def next_page(self, params, token_at):
+        """
+        A replayed (cached) page needs no wait. Otherwise the token is
+        polled from ``PAGE_TOKEN_FIRST_POLL`` seconds after it arrived, every
+        ``PAGE_TOKEN_POLL`` seconds, until it is accepted; after
+        ``PAGE_TOKEN_TIMEOUT`` the last answer is returned as is.
+        """
+        if self.cache is not None and self.cache.contains(NEARBY_SEARCH, params):
+            return self.get(NEARBY_SEARCH, params)
+
+        time.sleep(max(0.0, token_at + PAGE_TOKEN_FIRST_POLL - time.monotonic()))
+        while True:
+            data = self.get(NEARBY_SEARCH, params)
+            if data.get('status') != 'INVALID_REQUEST' or time.monotonic() - token_at >= PAGE_TOKEN_TIMEOUT:
+                return data
+            time.sleep(PAGE_TOKEN_POLL)
+
+    # === 🔎 Text search, returns the raw result list ===
+    def text_search(self, query):
+        try:
+            return self.get(TEXT_SEARCH, {'query': query}).get('results', [])
+        except Exception as e:
+            print(f"❌ Error during text search for {query}: {e}")
+            return []
+
+    # === 🧩 Raw details result covering `fields`, merged per place_id ===
+    def details_result(self, place_id, fields=DETAILS_FIELDS):
+        """
+        Only fields not already held for ``place_id`` are requested, and a
+        lookup already in flight for the same place is waited on instead of
+        sent twice. Raises like ``get`` when the request fails, and
+        ``PlacesApiError`` for any status but OK (nothing is kept then).
+        """
+        wanted = set(fields.split(','))
+        while True:
+            with self._lock:
+                have, result = self._details.get(place_id, (set(), {}))
+                missing = wanted - have
+                if not missing:
+                    self._details.move_to_end(place_id)
+                    return result
+                in_flight = self._details_in_flight.get(place_id)
+                if in_flight is None:
+                    in_flight = self._details_in_flight[place_id] = threading.Event()
+                    break
+            in_flight.wait()  # then check again: it may not have covered our fields
+
+        try:
+            # Whole stage mask when nothing is held yet, so cached responses keep matching
+            mask = fields if missing == wanted else ','.join(sorted(missing))
+            cached = self._cached_superset(place_id, missing)
+            if cached is not None:
+                mask, fetched = cached
+            else:
+                fetched = self._details_of(place_id, self.get(DETAILS, {'place_id': place_id, 'fields': mask}))
+            with self._lock:
+                have, result = self._details.get(place_id, (set(), {}))
+                result = {**result, **fetched}
+                self._details[place_id] = (have | set(mask.split(',')), result)
+                self._details.move_to_end(place_id)
+                while len(self._details) > self.details_memo:
+                    self._details.popitem(last=False)
+            return result
+        finally:
+            with self._lock:
+                del self._details_in_flight[place_id]
+            in_flight.set()
+
+    # === 💾 A cached response of a wider stage mask answers a narrower one for free ===
+    def _cached_superset(self, place_id, missing):
+        if self.cache is None:
+            return None
+        for mask in STAGE_MASKS:
+            params = {'place_id': place_id, 'fields': mask}
+            if missing <= set(mask.split(',')) and self.cache.contains(DETAILS, params):
+                return mask, self._details_of(place_id, self.get(DETAILS, params))
+        return None
+
+    # === 🚫 Only an OK answer has details; NOT_FOUND, REQUEST_DENIED, ... must not pass as empty ones ===
+    def _details_of(self, place_id, data):
+        status = data.get('status')
+        if status in GONE_STATUSES:
+            raise PlaceGone(f"{place_id} returned {status}")
+        if status != 'OK':
+            with self._lock:
+                self.failed += 1
+            raise PlacesApiError(f"details for {place_id} returned {status} {data.get('error_message', '')}".rstrip())
+        return data.get('result', {})
+
+    # === 🏨 Reviews, hours and photos for one place (only the keys `fields` asks for) ===
+    def get_place_details(self, place_id, fields=DETAILS_FIELDS):
+        """``{}`` when the lookup failed (worth retrying), ``None`` when the place is gone."""
+        try:
+            result = self.details_result(place_id, fields)
+        except PlaceGone as e:
+            print(f"🚫 Place no longer listed: {e}")
+            return None
+        except Exception as e:
+            print(f"❌ Error getting place details: {e}")
+            return {}
+
+        details = {}
+        for field in fields.split(','):
+            key = RESULT_KEYS.get(field, field)
+            if key == 'reviews':
+                details[key] = [{
+                    'author_name': r.get('author_name'),
+                    'rating': r.get('rating'),
+                    'text': r.get('text'),
+                    'time': r.get('time')
+                } for r in result.get('reviews', [])[:5]]
+            elif key == 'opening_hours':
+                details[key] = result.get('opening_hours', {})
+            elif key == 'photos':
+                details[key] = [p.get('photo_reference') for p in result.get('photos', [])[:4]]
+            else:
+                details[key] = result.get(key)
+        return details
+
+    # === ⚡ asyncio mode: one details lookup, bounded by the shared semaphore ===
+    async def get_place_details_async(self, place_id, semaphore, fields=DETAILS_FIELDS):
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self.get_place_details, place_id, fields)
+
+    async def gather_place_details(self, place_ids, fields=DETAILS_FIELDS):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self.get_place_details_async(pid, semaphore, fields) for pid in place_ids)
+        )
+
+    # === 📦 Fan out details for a batch of places; results keep input order ===
+    def get_details_for_page(self, place_ids, fields=DETAILS_FIELDS):
+        if not place_ids:
+            return []
+        return asyncio.run(self.gather_place_details(place_ids, fields))
+
+    def summary(self):
+        return (f"📡 Places: {self.requests} requests, {self.retries} retries, "
+                f"{self.failed} failed\n{self.limiter.summary()}\n{self.billing.summary()}")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
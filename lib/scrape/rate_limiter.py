@@ -0,0 +1,75 @@
+import threading
+import time
+
+# === ⚙️ Limiter defaults ===
+DEFAULT_RATE = 50           # requests/s; keep under the project's Places quota
+DEFAULT_MIN_RATE = 1
+BACKOFF_FACTOR = 0.5        # rate multiplier when the API says we are over quota
+RECOVERY_STEPS = 50         # successes to climb from the floor back to the ceiling
+CUT_COOLDOWN = 1.0          # seconds; one burst of throttled workers cuts the rate once
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread that calls one API.
+
+    ``acquire()`` blocks until a request may go out, so all workers
+    together stay under ``rate`` requests per second (with bursts of up to
+    ``burst``). The rate adapts: ``throttled()`` (an ``OVER_QUERY_LIMIT`` or
+    HTTP 429) cuts it by ``BACKOFF_FACTOR`` and empties the bucket, and every
+    ``succeeded()`` climbs back towards the ceiling, so throughput settles
+    just under the real quota instead of bouncing off it.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=None, min_rate=DEFAULT_MIN_RATE):
+        self.ceiling = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(float(min_rate), self.ceiling)
+        self.burst = burst or max(1.0, self.ceiling)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_cut = 0.0
+        self._lock = threading.Lock()
+        self.throttles = 0
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    # === 🚦 Block until one request may be sent ===
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+    # === 📉 Over quota: slow every worker down at once ===
+    def throttled(self):
+        with self._lock:
+            now = time.monotonic()
+            self.throttles += 1
+            if now - self._last_cut < CUT_COOLDOWN:
+                return
+            self._last_cut = now
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * BACKOFF_FACTOR)
+            self._tokens = 0
+
+    # === 📈 Additive recovery towards the ceiling ===
+    def succeeded(self):
+        if self.rate >= self.ceiling:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.ceiling, self.rate + (self.ceiling - self.min_rate) / RECOVERY_STEPS)
+
+    def summary(self):
+        return (f"🚦 Rate: {self.rate:.1f}/s now (ceiling {self.ceiling:.0f}/s), "
+                f"{self.throttles} throttled, {self.waited:.1f}s waited across workers")
@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+
+# === 📁 Local state lives next to the scripts ===
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, 'places_responses.sqlite')
+
+# === ⏱️ Time-to-live per endpoint (seconds) ===
+DAY = 24 * 60 * 60
+DEFAULT_TTLS = {
+    'nearbysearch': 1 * DAY,
+    'textsearch': 7 * DAY,
+    'details': 3 * DAY,
+    'photo': 30 * DAY,
+}
+DEFAULT_TTL = 1 * DAY
+
+# === 💾 LRU size cap for the whole cache ===
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Params that never change the response and must not leak into keys
+IGNORED_PARAMS = {'key'}
+
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode when a request has no cached response."""
+
+
+# === 🔑 Stable cache key: endpoint + sorted params (API key stripped) ===
+def make_key(endpoint, params):
+    normalized = sorted(
+        (str(k), str(v)) for k, v in params.items() if k not in IGNORED_PARAMS
+    )
+    return endpoint + '?' + '&'.join(f"{k}={v}" for k, v in normalized)
+
+
+def make_url_key(endpoint, url):
+    parts = urlsplit(url)
+    return make_key(endpoint, dict(parse_qsl(parts.query)))
+
+
+class ResponseCache:
+    """
+    On-disk SQLite cache for Places API responses.
+
+    Entries expire per endpoint (``ttls``) and the least recently used
+    entries are evicted once the cache grows past ``max_bytes``. With
+    ``offline=True`` every miss raises ``OfflineCacheMiss`` instead of
+    letting the caller go to the network, so later stages can be replayed
+    from a previous crawl.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttls=None, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    # === 📤 Raw bytes for a key, or None if missing/expired ===
+    def get_bytes(self, endpoint, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            # Offline replay ignores TTLs: stale data beats no data
+            if row and (self.offline or now - row[1] <= self.ttl_for(endpoint)):
+                self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+                self._conn.commit()
+                self.hits += 1
+                return row[0]
+
+        self.misses += 1
+        if self.offline:
+            raise OfflineCacheMiss(f"No cached response for {key}")
+        return None
+
+    # === 📥 Store raw bytes, then evict LRU entries over the size cap ===
+    def put_bytes(self, endpoint, key, body):
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, endpoint, body, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, endpoint, body, len(body), now, now)
+            )
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100'
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    # === 🧾 JSON helpers used by the Places client ===
+    def get_json(self, endpoint, params):
+        body = self.get_bytes(endpoint, make_key(endpoint, params))
+        return json.loads(body) if body is not None else None
+
+    def put_json(self, endpoint, params, data):
+        body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self.put_bytes(endpoint, make_key(endpoint, params), body)
+
+    def contains(self, endpoint, params):
+        key = make_key(endpoint, params)
+        with self._lock:
+            row = self._conn.execute('SELECT stored_at FROM responses WHERE key = ?', (key,)).fetchone()
+        return bool(row) and (self.offline or time.time() - row[0] <= self.ttl_for(endpoint))
+
+    # === 🧹 Drop every expired entry ===
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            for endpoint, ttl in self.ttls.items():
+                self._conn.execute(
+                    'DELETE FROM responses WHERE endpoint = ? AND stored_at < ?', (endpoint, now - ttl)
+                )
+            self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            self._conn.commit()
+
+    def summary(self):
+        return f"💾 Cache: {self.hits} hits, {self.misses} misses, {self._total_bytes / 1024 / 1024:.1f} MB on disk"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
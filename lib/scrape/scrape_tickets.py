@@ -1,25 +1,26 @@
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import firebase_admin
 from firebase_admin import credentials, firestore
 import json
 
+from browser_pool import BrowserPool, DEFAULT_BROWSERS, DEFAULT_PAGES_PER_BROWSER
+from browser_waits import wait_rows
+from firestore_writer import FirestoreWriter
+from http_pool import http_get
+from snapshot import write_tickets_snapshot
+from ticket2u_parser import parse_event, DEFAULT_ENCODING
+
 # ---------------- FIREBASE SETUP ----------------
 cred = credentials.Certificate(
     r"C:\Users\Acer\Documents\UiTM\SEM 6\Code\fyp25\android\app\service-account-file.json"
 )
 firebase_admin.initialize_app(cred)
 db = firestore.client()
-
-# ---------------- SELENIUM SETUP ----------------
-options = Options()
-options.headless = True  # Run Chrome in headless mode
-driver = webdriver.Chrome(options=options)
+writer = FirestoreWriter(db)  # events are committed in batches
 
 # ---------------- URL LIST ----------------
 urls = [
@@ -34,178 +35,94 @@ urls = [
     "https://www.ticket2u.com.my/event/18457/adopt-a-butterfly-melaka-butterfly-reptile-sanctuary"
 ]
 
-def is_visible_style(style_str):
-    """
-    Returns True if element is visible (no display:none),
-    considering spacing and case insensitivity.
-    """
-    if not style_str:
-        return True
-    style_clean = style_str.replace(' ', '').lower()
-    return 'display:none' not in style_clean
+# ---------------- HTTP-FIRST FETCHING ----------------
+HTTP_WORKERS = 8
+HTTP_TIMEOUT = 15
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
 
-def extract_price(item):
-    """
-    Extract the first visible MYR price from the ticket item,
-    ignoring any prices that contain 'USD'.
-    """
-    # Check for span with visible MYR price
-    price_span = item.find('span', class_='font--bold color--red')
-    if price_span:
-        style = price_span.get('style', '')
-        if is_visible_style(style):
-            text = price_span.get_text(strip=True)
-            if text and 'MYR' in text and 'USD' not in text:
-                return text
-
-    # Fallback: check subtitle div for visible MYR prices
-    subtitle_div = item.find('div', class_='card__item__subtitle')
-    if subtitle_div:
-        for div in subtitle_div.find_all(['div', 'span']):
-            style = div.get('style', '')
-            if is_visible_style(style):
-                text = div.get_text(strip=True)
-                if 'MYR' in text and 'USD' not in text:
-                    return text
-    return ''
-
-
-def extract_description(soup):
-    """
-    Extracts the main event description from the page.
-    """
-    desc_div = soup.find('div', class_='card__desc')
-    if desc_div:
-        inner_div = desc_div.find('div', style=lambda s: s and 'white-space:pre-line' in s)
-        if inner_div:
-            return inner_div.get_text(strip=True)
-    return ''
-
-def scrape_event(url):
+def scrape_event(driver, url):
     driver.get(url)
 
     try:
         WebDriverWait(driver, 15).until(
             EC.presence_of_element_located((By.CLASS_NAME, 'oTicketInfo'))
         )
+        # Ticket cards render after the container; wait until their count settles
+        wait_rows(driver, (By.CSS_SELECTOR, '.oTicketInfo .card--ticket'), timeout=5)
     except Exception as e:
         print(f"Timeout or error loading tickets on {url}: {e}")
 
-    time.sleep(2)  # extra wait for page to fully load
-
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-    # Event Name
-    event_name_tag = soup.find('h1')
-    event_name = event_name_tag.get_text(strip=True) if event_name_tag else 'Event name not found'
-
-    # Operation Hours
-    operation_hours_div = soup.find('div', class_='padding-top-s padding-bottom-s')
-    operation_hours = operation_hours_div.get_text(strip=True) if operation_hours_div else 'Operation hours not found'
-
-    # Description
-    description = extract_description(soup)
-
-    # Ticket Pricing
-    tickets = []
-    ticket_container = soup.find('div', class_='oTicketInfo')
-    if ticket_container:
-        ticket_cards = ticket_container.find_all('div', class_='card--ticket')
-        for card in ticket_cards:
-            # Category Name
-            category_div = card.find('div', class_='card__title')
-            if category_div:
-                # Remove all hidden divs inside category title before extracting text
-                for hidden_div in category_div.find_all('div', style=lambda s: s and not is_visible_style(s)):
-                    hidden_div.decompose()
-                category_name = category_div.get_text(strip=True)
-            else:
-                category_name = 'Unknown Category'
-
-            # Category Description
-            category_desc_div = card.find('div', class_='card__desc')
-            if category_desc_div:
-                inner_div = category_desc_div.find('div', style=lambda s: s and 'white-space:pre-line' in s)
-                category_description = inner_div.get_text(strip=True) if inner_div else '-'
-            else:
-                category_description = '-'
-
-            subcategories = []
-            ticket_items = card.find_all('div', class_='card__item')
-            if not ticket_items:
-                ticket_items = card.find_all('div', class_='card__item row')
-
-            for item in ticket_items:
-                subcat_div = item.find('div', class_='card__item__title')
-                if not subcat_div:
-                    continue
-                # Remove hidden divs inside subcategory title
-                for hidden_div in subcat_div.find_all('div', style=lambda s: s and not is_visible_style(s)):
-                    hidden_div.decompose()
-                subcategory_name = subcat_div.get_text(strip=True)
-
-                price = extract_price(item)
-
-                subcategories.append({
-                    'subcategory': subcategory_name,
-                    'price': price
-                })
-
-            tickets.append({
-                'category': category_name,
-                'description': category_description,
-                'subcategories': subcategories
-            })
-
-    # Build ticket pricing dictionary
-    ticket_pricing = {}
-    for ticket_category in tickets:
-        cat_name = ticket_category['category']
-        ticket_pricing[cat_name] = {
-            'description': ticket_category['description'],
-            'subcategories': {}
-        }
-        for subcat in ticket_category['subcategories']:
-            ticket_pricing[cat_name]['subcategories'][subcat['subcategory']] = subcat['price']
-
-    # Images extraction
-    hero_div = soup.find('div', class_='details__hero')
-    image_url_1 = ''
-    image_url_2 = ''
-    if hero_div:
-        bg_div = hero_div.find('div', class_='details__hero__bg')
-        if bg_div and bg_div.has_attr('style'):
-            style = bg_div['style']
-            if 'background-image' in style:
-                start = style.find("url('") + 5
-                end = style.find("')", start)
-                image_url_1 = style[start:end]
-
-        img_tag = hero_div.find('img')
-        if img_tag and img_tag.has_attr('src'):
-            image_url_2 = img_tag['src']
-
-    # Compose final event dictionary
-    event_data = {
-        "name": event_name,
-        "operation_hours": operation_hours,
-        "ticket_pricing": ticket_pricing,
-        "image_1": image_url_1,
-        "image_2": image_url_2
-    }
-
-    return event_data
+    return parse_event(driver.page_source)
 
-def upload_to_firestore(event):
-    doc_ref = db.collection('tickets').document()
-    doc_ref.set(event)
-    print(f"Uploaded event: {event['name']}")
+def fetch_event_http(url):
+    """
+    Fetches the page over the pooled HTTP session and parses it without a
+    browser. Returns None when the server-rendered page has no ticket
+    cards in oTicketInfo, so the caller falls back to Chrome.
+    """
+    try:
+        response = http_get(url, headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"HTTP fetch failed for {url}: {e}")
+        return None
 
-# Main scraping loop
-for url in urls:
-    print(f"Scraping {url}")
-    event_data = scrape_event(url)
-    print(json.dumps(event_data, indent=2, ensure_ascii=False))
-    upload_to_firestore(event_data)
+    if b'oTicketInfo' not in response.content:
+        return None
+    # requests falls back to ISO-8859-1 when the header names no charset, so only trust a declared one
+    declared = 'charset' in response.headers.get('Content-Type', '').lower()
+    event_data = parse_event(response.content, response.encoding if declared else DEFAULT_ENCODING)
+    return event_data if event_data['ticket_pricing'] else None
 
-driver.quit()
+def upload_to_firestore(event):
+    doc_ref = db.collection('tickets').document()
+    writer.set(doc_ref, event)
+    print(f"Queued event: {event['name']}")
+
+# ---------------- MAIN ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Scrape ticket2u events into Firestore")
+    parser.add_argument('--browsers', type=int, default=DEFAULT_BROWSERS,
+                        help="Headless Chrome sessions running in parallel")
+    parser.add_argument('--pages-per-browser', type=int, default=DEFAULT_PAGES_PER_BROWSER,
+                        help="Restart a session after this many pages")
+    parser.add_argument('--browser-only', action='store_true',
+                        help="Skip the plain HTTP attempt and render every page in Chrome")
+    args = parser.parse_args()
+
+    # 1) Plain HTTP first: most pages ship their tickets in the HTML
+    if args.browser_only:
+        results = [None] * len(urls)
+    else:
+        with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as executor:
+            results = list(executor.map(fetch_event_http, urls))
+
+    # 2) Chrome only for pages whose tickets were missing; results keep URL order
+    misses = [i for i, event_data in enumerate(results) if event_data is None]
+    print(f"HTTP parsed {len(urls) - len(misses)} events, {len(misses)} need a browser")
+    if misses:
+        with BrowserPool(size=min(args.browsers, len(misses)),
+                         pages_per_browser=args.pages_per_browser) as pool:
+            rendered = pool.map(scrape_event, [urls[i] for i in misses])
+        for i, event_data in zip(misses, rendered):
+            results[i] = event_data
+
+    events = []
+    for url, event_data in zip(urls, results):
+        if event_data is None:
+            print(f"Skipped {url}")
+            continue
+        print(json.dumps(event_data, indent=2, ensure_ascii=False))
+        upload_to_firestore(event_data)
+        events.append({**event_data, 'source': url})
+
+    writer.close()
+    write_tickets_snapshot('ticket2u', events, 'ticket2u.com.my')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+import json
+import os
+import re
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from geohash import geohash_fields, GEOHASH_FIELD
+from response_cache import CACHE_DIR
+
+# === 🗃️ Columnar snapshots of each run, next to the other local state ===
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+SCHEMA_VERSION = 1
+SCHEMA_VERSION_KEY = b'schema_version'
+COMPRESSION = 'zstd'
+ROW_GROUP_SIZE = 1000
+# Empty file in a run directory whose tables leave out part of what was crawled
+PARTIAL_MARKER = 'PARTIAL'
+
+PLACES = 'places'
+REVIEWS = 'reviews'
+TICKETS = 'tickets'
+
+SCHEMAS = {
+    PLACES: pa.schema([
+        ('place_id', pa.string()),
+        ('name', pa.string()),
+        ('address', pa.string()),
+        ('rating', pa.float64()),
+        ('rating_count', pa.int64()),
+        ('latitude', pa.float64()),
+        ('longitude', pa.float64()),
+        (GEOHASH_FIELD, pa.string()),
+        ('types', pa.list_(pa.string())),
+        ('searched_type', pa.string()),
+        ('photos', pa.list_(pa.string())),
+        ('opening_hours', pa.string()),  # JSON, shape varies by place
+    ]),
+    REVIEWS: pa.schema([
+        ('place_id', pa.string()),
+        ('author_name', pa.string()),
+        ('rating', pa.float64()),
+        ('text', pa.string()),
+        ('time', pa.timestamp('s', tz='UTC')),
+    ]),
+    TICKETS: pa.schema([
+        ('site', pa.string()),
+        ('source', pa.string()),
+        ('event', pa.string()),
+        ('package', pa.string()),
+        ('package_description', pa.string()),
+        ('ticket', pa.string()),
+        ('ticket_description', pa.string()),
+        ('price', pa.string()),
+        ('currency', pa.string()),
+        ('amount', pa.float64()),
+    ]),
+}
+
+_PRICE = re.compile(r'([A-Z]{3})\s*([0-9][0-9,]*(?:\.[0-9]+)?)')
+
+
+def _number(value, cast=float):
+    try:
+        return cast(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# === 📍 Place dicts (as built by the scrapers) -> places + reviews rows ===
+def place_rows(places):
+    places_rows, review_rows = [], []
+    for place in places:
+        place_id = place.get('place_id')
+        lat, lng = _number(place.get('latitude')), _number(place.get('longitude'))
+        places_rows.append({
+            'place_id': place_id,
+            'name': place.get('name'),
+            'address': place.get('address'),
+            'rating': _number(place.get('rating')),
+            'rating_count': _number(place.get('rating_count'), int),
+            'latitude': lat,
+            'longitude': lng,
+            GEOHASH_FIELD: geohash_fields(lat, lng).get(GEOHASH_FIELD),
+            'types': place.get('types') or [],
+            'searched_type': place.get('searched_type'),
+            'photos': place.get('photos') or [],
+            'opening_hours': json.dumps(place.get('opening_hours') or {}, ensure_ascii=False, sort_keys=True),
+        })
+        for review in place.get('reviews') or []:
+            review_rows.append({
+                'place_id': place_id,
+                'author_name': review.get('author_name'),
+                'rating': _number(review.get('rating')),
+                'text': review.get('text'),
+                'time': _number(review.get('time'), int),
+            })
+    return places_rows, review_rows
+
+
+# === 🎟️ Scraped events (ticket2u or tiket.com shape) -> one row per ticket ===
+def ticket_rows(events, site):
+    rows = []
+
+    def add(event, source, package, package_description, ticket, ticket_description, price):
+        match = _PRICE.search(price or '')
+        rows.append({
+            'site': site,
+            'source': source,
+            'event': event,
+            'package': package,
+            'package_description': package_description,
+            'ticket': ticket,
+            'ticket_description': ticket_description,
+            'price': price,
+            'currency': match.group(1) if match else None,
+            'amount': float(match.group(2).replace(',', '')) if match else None,
+        })
+
+    for event in events:
+        source = event.get('source')
+        if 'ticket_pricing' in event:  # ticket2u: category -> subcategory -> price
+            for category, info in event['ticket_pricing'].items():
+                for subcategory, price in info.get('subcategories', {}).items():
+                    add(event.get('name'), source, category, info.get('description'), subcategory, None, price)
+        else:  # tiket.com: packages -> tickets
+            for package in event.get('packages', []):
+                for ticket in package.get('tickets', []):
+                    add(event.get('title'), source, package.get('package_name'), None,
+                        ticket.get('type'), ticket.get('description'), ticket.get('price'))
+    return rows
+
+
+def _run_dir(name, root):
+    run_dir = os.path.join(root, name, time.strftime('%Y%m%dT%H%M%SZ', time.gmtime()))
+    os.makedirs(run_dir, exist_ok=True)
+    return run_dir
+
+
+def _versioned(table_name):
+    return SCHEMAS[table_name].with_metadata({SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode()})
+
+
+# === 💾 Write one run's tables as compressed Parquet, stamped with the schema version ===
+def write_snapshot(name, tables, root=SNAPSHOT_DIR):
+    """
+    ``tables`` maps a table name (``PLACES``, ``REVIEWS``, ``TICKETS``) to
+    rows. Each is written to ``<root>/<name>/<run>/<table>.parquet`` where
+    ``run`` is a UTC timestamp, so snapshots sort by time. Returns the run
+    directory.
+    """
+    run_dir = _run_dir(name, root)
+
+    for table_name, rows in tables.items():
+        table = pa.Table.from_pylist(rows, schema=_versioned(table_name))
+        path = os.path.join(run_dir, f'{table_name}.parquet')
+        tmp_path = path + '.tmp'
+        pq.write_table(table, tmp_path, compression=COMPRESSION)
+        os.replace(tmp_path, path)
+
+    counts = ', '.join(f"{len(rows)} {table_name}" for table_name, rows in tables.items())
+    print(f"🗃️ Snapshot '{name}': {counts} -> {run_dir}")
+    return run_dir
+
+
+class SnapshotWriter:
+    """
+    Streaming version of ``write_snapshot`` for pipelines: rows are added
+    as they are produced and written out one row group at a time, so only
+    ``row_group_size`` rows per table are held in memory. Thread-safe.
+    Files appear under their final name on ``close()``; a run closed with
+    ``partial=True`` (an incremental or resumed crawl that skipped places)
+    is marked so ``load_snapshot`` passes over it by default.
+    """
+
+    def __init__(self, name, tables=(PLACES, REVIEWS), root=SNAPSHOT_DIR, row_group_size=ROW_GROUP_SIZE):
+        self.name = name
+        self.run_dir = _run_dir(name, root)
+        self.row_group_size = row_group_size
+        self._buffers = {t: [] for t in tables}
+        self._counts = {t: 0 for t in tables}
+        self._writers = {
+            t: pq.ParquetWriter(self._path(t) + '.tmp', _versioned(t), compression=COMPRESSION)
+            for t in tables
+        }
+        self._lock = threading.Lock()
+
+    def _path(self, table_name):
+        return os.path.join(self.run_dir, f'{table_name}.parquet')
+
+    def _flush(self, table_name):
+        rows, self._buffers[table_name] = self._buffers[table_name], []
+        if rows:
+            self._writers[table_name].write_table(pa.Table.from_pylist(rows, schema=_versioned(table_name)))
+
+    def add(self, table_name, rows):
+        with self._lock:
+            self._buffers[table_name].extend(rows)
+            self._counts[table_name] += len(rows)
+            if len(self._buffers[table_name]) >= self.row_group_size:
+                self._flush(table_name)
+
+    def add_places(self, places):
+        places_rows, review_rows = place_rows(places)
+        self.add(PLACES, places_rows)
+        self.add(REVIEWS, review_rows)
+
+    def close(self, partial=False):
+        with self._lock:
+            if partial:
+                open(os.path.join(self.run_dir, PARTIAL_MARKER), 'w').close()
+            for table_name, writer in self._writers.items():
+                self._flush(table_name)
+                writer.close()
+                os.replace(self._path(table_name) + '.tmp', self._path(table_name))
+        counts = ', '.join(f"{n} {t}" for t, n in self._counts.items())
+        print(f"🗃️ Snapshot '{self.name}': {counts}{' (partial)' if partial else ''} -> {self.run_dir}")
+
+
+def write_places_snapshot(name, places, root=SNAPSHOT_DIR):
+    places_rows, review_rows = place_rows(places)
+    return write_snapshot(name, {PLACES: places_rows, REVIEWS: review_rows}, root)
+
+
+def write_tickets_snapshot(name, events, site, root=SNAPSHOT_DIR):
+    return write_snapshot(name, {TICKETS: ticket_rows(events, site)}, root)
+
+
+# === 📂 Runs of a snapshot, oldest first (complete ones only unless asked) ===
+def list_runs(name, root=SNAPSHOT_DIR, include_partial=False):
+    directory = os.path.join(root, name)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        d for d in os.listdir(directory)
+        if os.path.isdir(os.path.join(directory, d))
+        and (include_partial or not os.path.exists(os.path.join(directory, d, PARTIAL_MARKER)))
+    )
+
+
+# === 📖 Memory-mapped read of one table (latest complete run unless given) ===
+def load_snapshot(name, table, run=None, columns=None, root=SNAPSHOT_DIR, include_partial=False):
+    """
+    Read ``table`` from a snapshot as a ``pyarrow.Table``. The file is
+    memory-mapped and only ``columns`` (all when ``None``) are decoded.
+    Without ``run`` the latest run is read, skipping partial ones unless
+    ``include_partial``. Raises ``FileNotFoundError`` when there is no such
+    snapshot and ``ValueError`` when it was written with another schema
+    version.
+    """
+    if run is None:
+        runs = list_runs(name, root, include_partial)
+        if not runs:
+            raise FileNotFoundError(f"No '{name}' snapshot in {root}")
+        run = runs[-1]
+
+    path = os.path.join(root, name, run, f'{table}.parquet')
+    version = (pq.read_schema(path, memory_map=True).metadata or {}).get(SCHEMA_VERSION_KEY, b'0')
+    if int(version) != SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema version {int(version)}, expected {SCHEMA_VERSION}")
+    return pq.read_table(path, columns=columns, memory_map=True)
@@ -0,0 +1,136 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# === 🎯 Score needed to keep a tag when no category rule decides it ===
+SCORE_THRESHOLD = 0.09
+
+
+class Rule(namedtuple('Rule', 'category name_keywords type_keywords tags fallthrough name_requires')):
+    """
+    One row of a rules table.
+
+    A place matches when its lowercased name contains any of
+    ``name_keywords`` or its types include any of ``type_keywords`` (exact
+    match), and its name also contains every keyword in ``name_requires``.
+    A matching rule decides every tag: tags in ``tags`` are kept, the rest
+    dropped. With ``fallthrough=True`` it only keeps its own tags and lets
+    the next matching rule decide the others.
+    """
+    __slots__ = ()
+
+
+def rule(category, names=(), types=(), tags=(), fallthrough=False, requires=()):
+    return Rule(category, tuple(names), frozenset(types), frozenset(tags), fallthrough, tuple(requires))
+
+
+class RuleSet:
+    """
+    A rules table compiled once into a single name regex plus type sets.
+
+    ``match`` classifies a place into its ordered matching rules with one
+    regex pass; ``decisions`` turns that into a per-tag keep/drop/score
+    table (cached per rule combination) so tags are filtered in one pass.
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        keywords = {k for r in self.rules for k in r.name_keywords + r.name_requires}
+
+        # Longest first so the lookahead reports the longest keyword at each
+        # position; shorter keywords it contains are implied below
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in ordered) + '))') if ordered else None
+        self._implied = {k: frozenset(o for o in keywords if o in k) for k in keywords}
+        self._known_tags = frozenset(t for r in self.rules for t in r.tags)
+
+    # === 🔎 Every keyword present in the (lowercased) name ===
+    def name_keywords(self, name):
+        found = set()
+        if self._pattern is not None:
+            for m in self._pattern.finditer(name.lower()):
+                found |= self._implied[m.group(1)]
+        return found
+
+    # === 🗂️ Indices of matching rules, in table order ===
+    def match(self, name, types):
+        found = self.name_keywords(name or '')
+        types_lower = {t.lower() for t in types or []}
+        return tuple(
+            i for i, r in enumerate(self.rules)
+            if (found.intersection(r.name_keywords) or types_lower & r.type_keywords)
+            and found.issuperset(r.name_requires)
+        )
+
+    # === ⚖️ tag -> True (keep) / False (drop) / None (use score) ===
+    @lru_cache(maxsize=None)
+    def decisions(self, matched):
+        def decide(tag):
+            for i in matched:
+                r = self.rules[i]
+                if tag in r.tags:
+                    return True
+                if not r.fallthrough:
+                    return False
+            return None
+
+        table = {tag: decide(tag) for tag in self._known_tags}
+        return table, decide(None)  # None stands in for any tag no rule mentions
+
+    # === 🏷️ Keep predicted tags the place's category allows ===
+    def select_tags(self, name, predicted_tags_with_scores, types, threshold=SCORE_THRESHOLD):
+        table, default = self.decisions(self.match(name, types))
+        selected = []
+        for tag, score in predicted_tags_with_scores:
+            verdict = table.get(tag, default)
+            if verdict or (verdict is None and score >= threshold):
+                selected.append(tag)
+        return list(dict.fromkeys(selected))
+
+    # === 🏷️ Rule-only tagging: union of tags from every matching rule ===
+    def tags_for(self, name, types):
+        tags = []
+        for i in self.match(name, types):
+            tags.extend(sorted(self.rules[i].tags))
+        return list(dict.fromkeys(tags))
+
+
+# === 📋 Category rules for ML-suggested tags (try.py) ===
+# Order matters: the first deciding rule wins, as in an if/elif chain
+CATEGORY_RULES = RuleSet([
+    rule("lodging", names=["resort", "hotel"], types=["lodging"],
+         tags=["Relaxing", "Family Friendly", "Photogenic", "Parking Available"]),
+    rule("theme_park", names=["theme park", "water park"], types=["amusement"],
+         tags=["Family Friendly", "Adventure", "Photogenic"], fallthrough=True),
+    rule("museum", names=["museum"], types=["museum"],
+         tags=["Historical", "Educational", "Cultural"]),
+    rule("gallery", names=["gallery"],
+         tags=["Photogenic", "Instagrammable", "Cultural"], fallthrough=True),
+    rule("beach", names=["beach", "bay"], types=["natural_feature"],
+         tags=["Beach", "Relaxing", "Nature"]),
+    rule("cafe", names=["cafe", "coffee"], types=["cafe"],
+         tags=["Foodie", "Relaxing"]),
+    rule("mall", names=["mall", "market"], types=["shopping_mall"],
+         tags=["Shopping", "Budget Friendly", "Foodie"]),
+    rule("restaurant", names=["restaurant"], types=["restaurant"],
+         tags=["Foodie", "Local Cuisine"]),
+    rule("camping", names=["camp"], types=["campground"],
+         tags=["Nature", "Adventure", "Relaxing"]),
+    rule("religious", names=["masjid", "mosque", "gereja", "church", "temple", "tokong", "kuil"],
+         types=["place_of_worship"],
+         tags=["Cultural", "Historical", "Heritage", "Religious", "Photogenic"]),
+    rule("a_famosa_water", names=["a famosa"], requires=["water"],
+         tags=["Family Friendly", "Adventure", "Historical", "Heritage", "Photogenic"]),
+    rule("a_famosa", names=["a famosa"],
+         tags=["Historical", "Heritage", "Photogenic"]),
+])
+
+# === 📋 Keyword tags for scraped mosques (mosque.py) ===
+KEYWORD_RULES = RuleSet([
+    rule("religious", names=["masjid", "mosque", "place_of_worship"],
+         types=["masjid", "mosque", "place_of_worship"], tags=["Religious"]),
+    rule("heritage", names=["heritage", "sejarah"],
+         types=["heritage", "sejarah"], tags=["Heritage"]),
+    rule("photogenic", names=["view", "photo", "selat", "landmark"],
+         types=["view", "photo", "selat", "landmark"], tags=["Photogenic"]),
+])
@@ -0,0 +1,111 @@
+import hashlib
+import os
+from multiprocessing import Pool
+
+from response_cache import ResponseCache, CACHE_DIR
+
+# === 🧠 Zero-shot model ===
+DEFAULT_MODEL = "facebook/bart-large-mnli"
+DEFAULT_BATCH_SIZE = 16
+
+# === 💾 Predictions never expire: same text + labels + model = same scores ===
+PREDICTION_CACHE_PATH = os.path.join(CACHE_DIR, 'tag_predictions.sqlite')
+PREDICTION_ENDPOINT = 'zero_shot'
+NEVER_EXPIRES = 100 * 365 * 24 * 60 * 60
+
+
+# === #️⃣ Cache key for one description under one label set and model ===
+def prediction_key(description, labels, model):
+    payload = '\x1f'.join([model, '\x1e'.join(labels), description])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_classifier(model=DEFAULT_MODEL):
+    from transformers import pipeline
+    return pipeline("zero-shot-classification", model=model)
+
+
+# === 🧵 Multi-process CPU mode: one model per worker process ===
+_worker_classifier = None
+
+
+def _init_worker(model, threads):
+    global _worker_classifier
+    import torch
+    torch.set_num_threads(threads)
+    _worker_classifier = load_classifier(model)
+
+
+def _classify_chunk(args):
+    descriptions, labels, batch_size = args
+    outputs = _worker_classifier(descriptions, candidate_labels=labels, batch_size=batch_size)
+    return [list(zip(o["labels"], o["scores"])) for o in outputs]
+
+
+class TaggingEngine:
+    """
+    Batched, cached zero-shot tagger.
+
+    ``classify`` takes many descriptions at once. Descriptions already seen
+    with the same label set and model are answered from an on-disk cache;
+    the rest go through the pipeline in batches of ``batch_size``, or are
+    split across ``workers`` processes (each with its own copy of the model
+    and ``cpu_count // workers`` torch threads) when ``workers > 1``.
+    """
+
+    def __init__(self, labels, model=DEFAULT_MODEL, classifier=None,
+                 batch_size=DEFAULT_BATCH_SIZE, workers=1, cache_path=PREDICTION_CACHE_PATH):
+        self.labels = list(labels)
+        self.model = model
+        self.classifier = classifier
+        self.batch_size = batch_size
+        self.workers = workers
+        self.cache = ResponseCache(cache_path, ttls={PREDICTION_ENDPOINT: NEVER_EXPIRES})
+
+    def _cache_params(self, description):
+        return {'hash': prediction_key(description, self.labels, self.model)}
+
+    # === 📋 [(label, score), ...] per description, best label first ===
+    def classify(self, descriptions):
+        results = [None] * len(descriptions)
+        misses = []
+
+        for i, description in enumerate(descriptions):
+            cached = self.cache.get_json(PREDICTION_ENDPOINT, self._cache_params(description))
+            if cached is not None:
+                results[i] = [tuple(pair) for pair in cached]
+            else:
+                misses.append(i)
+
+        if misses:
+            # Identical descriptions in one call only go through the model once
+            unique = list(dict.fromkeys(descriptions[i] for i in misses))
+            print(f"🧠 Classifying {len(unique)} descriptions ({len(descriptions) - len(misses)} cached)...")
+            predictions = dict(zip(unique, self._run(unique)))
+            for description, prediction in predictions.items():
+                self.cache.put_json(PREDICTION_ENDPOINT, self._cache_params(description), prediction)
+            for i in misses:
+                results[i] = predictions[descriptions[i]]
+
+        return results
+
+    def _run(self, descriptions):
+        if self.workers > 1:
+            return self._run_multiprocess(descriptions)
+
+        if self.classifier is None:
+            self.classifier = load_classifier(self.model)
+        outputs = self.classifier(descriptions, candidate_labels=self.labels, batch_size=self.batch_size)
+        if isinstance(outputs, dict):  # a single description comes back unwrapped
+            outputs = [outputs]
+        return [list(zip(o["labels"], o["scores"])) for o in outputs]
+
+    def _run_multiprocess(self, descriptions):
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        size = max(1, -(-len(descriptions) // self.workers))
+        chunks = [
+            (descriptions[i:i + size], self.labels, self.batch_size)
+            for i in range(0, len(descriptions), size)
+        ]
+        with Pool(self.workers, initializer=_init_worker, initargs=(self.model, threads)) as pool:
+            return [prediction for chunk in pool.map(_classify_chunk, chunks) for prediction in chunk]
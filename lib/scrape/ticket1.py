@@ -1,20 +1,23 @@
-from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+import argparse
 import json
-import time
 
-# Setup Chrome options
-options = webdriver.ChromeOptions()
-#options.add_argument("--headless")  # optional: show browser if needed
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
+from browser_pool import BrowserPool, make_chrome, DEFAULT_BROWSERS, DEFAULT_PAGES_PER_BROWSER
+from browser_waits import wait_document_ready, wait_gone, wait_rows
+from snapshot import write_tickets_snapshot
 
-# Start Chrome WebDriver
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+# === ⏱️ How long to wait for each page event (seconds) ===
+PAGE_TIMEOUT = 15     # document ready
+HOURS_TIMEOUT = 3     # opening hours rows after clicking 'Open'
+MODAL_TIMEOUT = 5     # ticket rows in a package modal, and the modal closing
+
+# Rows of the package modal; gone again once the modal closes
+TICKET_ROWS = (By.CSS_SELECTOR, "div.TicketQuantity_ticket_name__TY9Ce")
 
 # List of URLs to scrape
 urls = [
@@ -39,12 +42,11 @@ urls = [
 ]
 
 
-all_data = []
-
-for url in urls:
+# === 🎟️ Scrape one tiket.com page on the given driver ===
+def scrape_tiket(driver, url):
     print(f"\n🔄 Scraping: {url}")
     driver.get(url)
-    time.sleep(2)
+    wait_document_ready(driver, PAGE_TIMEOUT)
 
     # Hide floating app banner
     try:
@@ -73,7 +75,7 @@ for url in urls:
         )
         open_btn.click()
         print("✅ Clicked 'Open' to reveal opening hours")
-        time.sleep(1)
+        wait_rows(driver, (By.CSS_SELECTOR, ".SectionSummary_day_row___uNsN"), HOURS_TIMEOUT)
     except Exception as e:
         print(f"❌ Failed to click 'Open': {e}")
 
@@ -126,16 +128,12 @@ for url in urls:
         for i, button in enumerate(original_buttons):
             try:
                 driver.execute_script("arguments[0].click();", button)
-                time.sleep(2)
 
                 # Use pre-extracted package name
                 package_name = package_titles[i] if i < len(package_titles) else f"Package {i+1}"
 
-                # Ticket details
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.TicketQuantity_ticket_name__TY9Ce"))
-                )
-                ticket_name_elements = driver.find_elements(By.CSS_SELECTOR, "div.TicketQuantity_ticket_name__TY9Ce")
+                # Ticket details: wait until the modal's rows stop appearing
+                ticket_name_elements = wait_rows(driver, TICKET_ROWS, MODAL_TIMEOUT)
                 print(f"Package '{package_name}': Found {len(ticket_name_elements)} ticket(s)")
 
                 tickets = []
@@ -172,7 +170,8 @@ for url in urls:
                     driver.execute_script("arguments[0].click();", close_btn)
                 except:
                     driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                time.sleep(1)
+                # The next package's rows must not be confused with this one's
+                wait_gone(driver, TICKET_ROWS, MODAL_TIMEOUT)
 
             except Exception as e:
                 print(f"❌ Failed to process 'Select' button #{i+1}: {e}")
@@ -181,20 +180,45 @@ for url in urls:
     except Exception as e:
         print(f"❌ Could not find or process any 'Select' buttons: {e}")
 
-    # Save data for this URL
-    all_data.append({
+    # Data for this URL
+    return {
         "title": title,
         "opening_hours": opening_hours,
         "images": images,
         "packages": package_data,
         "source": url
-    })
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape tiket.com packages into tiket_all_data.json")
+    parser.add_argument('--browsers', type=int, default=DEFAULT_BROWSERS,
+                        help="Chrome sessions running in parallel")
+    parser.add_argument('--pages-per-browser', type=int, default=DEFAULT_PAGES_PER_BROWSER,
+                        help="Restart a session after this many pages")
+    parser.add_argument('--show', action='store_true',
+                        help="Show the browser windows instead of running headless")
+    args = parser.parse_args()
+
+    # Resolve chromedriver once; every session gets its own Service
+    driver_path = ChromeDriverManager().install()
+
+    def factory():
+        return make_chrome(headless=not args.show, service=Service(driver_path))
+
+    # Pages are scraped in parallel; results come back in URL order
+    with BrowserPool(factory, size=args.browsers, pages_per_browser=args.pages_per_browser) as pool:
+        all_data = [data for data in pool.map(scrape_tiket, urls) if data is not None]
+
+    # Save to JSON
+    with open("tiket_all_data.json", "w", encoding="utf-8") as f:
+        json.dump(all_data, f, indent=4, ensure_ascii=False)
+
+    # Same data as a compressed, typed Parquet snapshot
+    write_tickets_snapshot('tiket', all_data, 'tiket.com')
 
-    time.sleep(2)
+    print("\n🎉 Scraping selesai dan data disimpan ke 'tiket_all_data.json'")
 
-# Save to JSON
-with open("tiket_all_data.json", "w", encoding="utf-8") as f:
-    json.dump(all_data, f, indent=4, ensure_ascii=False)
 
-driver.quit()
-print("\n🎉 Scraping selesai dan data disimpan ke 'tiket_all_data.json'")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import lxml.html
+from lxml import etree
+
+# ticket2u serves UTF-8; without this lxml reads undeclared bytes as latin-1
+DEFAULT_ENCODING = 'utf-8'
+
+
+# === 🧭 Selectors, compiled once per process ===
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+FIRST_H1 = etree.XPath("(//h1)[1]")
+OPERATION_HOURS = etree.XPath("(//div[@class='padding-top-s padding-bottom-s'])[1]")
+TICKET_CARDS = etree.XPath(f"(//div[{_has_class('oTicketInfo')}])[1]//div[{_has_class('card--ticket')}]")
+CARD_TITLE = etree.XPath(f"(.//div[{_has_class('card__title')}])[1]")
+CARD_DESC = etree.XPath(f"(.//div[{_has_class('card__desc')}])[1]")
+PRE_LINE = etree.XPath("(.//div[contains(@style, 'white-space:pre-line')])[1]")
+CARD_ITEMS = etree.XPath(f".//div[{_has_class('card__item')}]")
+ITEM_TITLE = etree.XPath(f"(.//div[{_has_class('card__item__title')}])[1]")
+PRICE_SPAN = etree.XPath("(.//span[@class='font--bold color--red'])[1]")
+ITEM_SUBTITLE = etree.XPath(f"(.//div[{_has_class('card__item__subtitle')}])[1]")
+SUBTITLE_PARTS = etree.XPath(".//div | .//span")
+HERO = etree.XPath(f"(//div[{_has_class('details__hero')}])[1]")
+HERO_BG = etree.XPath(f"(.//div[{_has_class('details__hero__bg')}])[1]")
+HERO_IMG = etree.XPath("(.//img)[1]")
+
+
+def _first(xpath, node):
+    found = xpath(node)
+    return found[0] if found else None
+
+
+def is_visible_style(style_str):
+    """
+    Returns True if element is visible (no display:none),
+    considering spacing and case insensitivity.
+    """
+    if not style_str:
+        return True
+    return 'display:none' not in style_str.replace(' ', '').lower()
+
+
+def text_of(node, skip_hidden=False):
+    """
+    Stripped text pieces of ``node`` joined without separators. With
+    ``skip_hidden`` every ``div`` styled ``display:none`` is left out,
+    subtree included, in the same single walk.
+    """
+    parts = []
+
+    def walk(element):
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            if isinstance(child.tag, str):  # comments and PIs only contribute their tail
+                if not (skip_hidden and child.tag == 'div' and not is_visible_style(child.get('style'))):
+                    walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(node)
+    return ''.join(p.strip() for p in parts)
+
+
+def extract_price(item):
+    """
+    Extract the first visible MYR price from the ticket item,
+    ignoring any prices that contain 'USD'.
+    """
+    price_span = _first(PRICE_SPAN, item)
+    if price_span is not None and is_visible_style(price_span.get('style', '')):
+        text = text_of(price_span)
+        if text and 'MYR' in text and 'USD' not in text:
+            return text
+
+    subtitle_div = _first(ITEM_SUBTITLE, item)
+    if subtitle_div is not None:
+        for part in SUBTITLE_PARTS(subtitle_div):
+            if is_visible_style(part.get('style', '')):
+                text = text_of(part)
+                if 'MYR' in text and 'USD' not in text:
+                    return text
+    return ''
+
+
+def extract_description(root):
+    """
+    Extracts the main event description from the page.
+    """
+    desc_div = _first(CARD_DESC, root)
+    if desc_div is not None:
+        inner_div = _first(PRE_LINE, desc_div)
+        if inner_div is not None:
+            return text_of(inner_div)
+    return ''
+
+
+def _background_url(style):
+    start = style.find("url('") + 5
+    end = style.find("')", start)
+    return style[start:end]
+
+
+# === 📄 HTML (bytes or str) -> event dict, no I/O ===
+def parse_event(html, encoding=DEFAULT_ENCODING):
+    """``encoding`` decodes ``html`` when it is bytes; str is parsed as is."""
+    if isinstance(html, bytes):
+        root = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+    else:
+        root = lxml.html.fromstring(html)
+
+    event_name_tag = _first(FIRST_H1, root)
+    event_name = text_of(event_name_tag) if event_name_tag is not None else 'Event name not found'
+
+    operation_hours_div = _first(OPERATION_HOURS, root)
+    operation_hours = text_of(operation_hours_div) if operation_hours_div is not None else 'Operation hours not found'
+
+    # Ticket pricing: category -> description + subcategory prices
+    ticket_pricing = {}
+    for card in TICKET_CARDS(root):
+        category_div = _first(CARD_TITLE, card)
+        category_name = text_of(category_div, skip_hidden=True) if category_div is not None else 'Unknown Category'
+
+        category_desc_div = _first(CARD_DESC, card)
+        inner_div = _first(PRE_LINE, category_desc_div) if category_desc_div is not None else None
+        category_description = text_of(inner_div) if inner_div is not None else '-'
+
+        subcategories = {}
+        for item in CARD_ITEMS(card):
+            subcat_div = _first(ITEM_TITLE, item)
+            if subcat_div is None:
+                continue
+            subcategories[text_of(subcat_div, skip_hidden=True)] = extract_price(item)
+
+        ticket_pricing[category_name] = {
+            'description': category_description,
+            'subcategories': subcategories,
+        }
+
+    # Images
+    image_url_1 = ''
+    image_url_2 = ''
+    hero_div = _first(HERO, root)
+    if hero_div is not None:
+        bg_div = _first(HERO_BG, hero_div)
+        if bg_div is not None and 'background-image' in bg_div.get('style', ''):
+            image_url_1 = _background_url(bg_div.get('style'))
+
+        img_tag = _first(HERO_IMG, hero_div)
+        if img_tag is not None and img_tag.get('src') is not None:
+            image_url_2 = img_tag.get('src')
+
+    return {
+        "name": event_name,
+        "operation_hours": operation_hours,
+        "ticket_pricing": ticket_pricing,
+        "image_1": image_url_1,
+        "image_2": image_url_2
+    }
+
+
+def _parse_file(path):
+    with open(path, 'rb') as f:
+        return parse_event(f.read())
+
+
+# === 🧵 Parse many pages across processes; results keep input order ===
+def parse_pages(pages, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_event, pages, chunksize=4))
+
+
+def parse_files(paths, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_file, paths, chunksize=4))
+
+
+# === ⏱️ Parse saved pages: python ticket2u_parser.py pages/*.html ===
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parse saved ticket2u pages into event JSON")
+    parser.add_argument('paths', nargs='+', help="Saved HTML pages")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parser processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    events = parse_files(args.paths, args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps(events, indent=2, ensure_ascii=False))
+    print(f"Parsed {len(events)} pages in {elapsed:.2f}s ({len(events) / elapsed:.1f} pages/s)")
@@ -0,0 +1,195 @@
+import math
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from places_client import CACHEABLE_STATUSES
+
+# === 🗺️ MELAKA BOUNDING BOX (south, west, north, east) ===
+MELAKA_BOUNDS = (2.05, 101.95, 2.55, 102.55)
+
+# === 📏 Google caps every nearbysearch at 3 pages x 20 results ===
+MAX_RESULTS_PER_QUERY = 60
+
+# === ⚙️ Tiling defaults ===
+DEFAULT_GRID = (4, 4)       # rows, cols of the starting grid
+DEFAULT_MAX_DEPTH = 5       # each level splits a cell into 4 quadrants
+DEFAULT_WORKERS = 8         # (cell, query) pairs crawled at the same time
+
+EARTH_RADIUS_M = 6371000
+
+
+class _CollectFailed(Exception):
+    """``collect`` raised (e.g. a downstream pipeline stopped): abort the crawl."""
+
+
+# === 🔲 One rectangular crawl cell ===
+class Cell(namedtuple('Cell', 'south west north east depth')):
+    __slots__ = ()
+
+    @property
+    def center(self):
+        return ((self.south + self.north) / 2, (self.west + self.east) / 2)
+
+    # Radius of the circle that fully covers the cell (center to corner)
+    @property
+    def radius(self):
+        lat, lng = self.center
+        return math.ceil(haversine_m(lat, lng, self.north, self.east))
+
+    # === ✂️ Split into 4 quadrants ===
+    def split(self):
+        lat, lng = self.center
+        depth = self.depth + 1
+        return [
+            Cell(self.south, self.west, lat, lng, depth),
+            Cell(self.south, lng, lat, self.east, depth),
+            Cell(lat, self.west, self.north, lng, depth),
+            Cell(lat, lng, self.north, self.east, depth),
+        ]
+
+
+# === 📐 Great-circle distance in metres ===
+def haversine_m(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+# === 🧱 Split a bounding box into a rows x cols starting grid ===
+def plan_grid(bounds=MELAKA_BOUNDS, grid=DEFAULT_GRID):
+    south, west, north, east = bounds
+    rows, cols = grid
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    return [
+        Cell(south + r * lat_step, west + c * lng_step,
+             south + (r + 1) * lat_step, west + (c + 1) * lng_step, 0)
+        for r in range(rows) for c in range(cols)
+    ]
+
+
+# === 🔍 Every raw result for one query inside one cell ===
+def search_cell(client, cell, query):
+    results = []
+    for data in client.nearby_search_pages(cell.center, cell.radius, **query):
+        results.extend(data.get('results', []))
+    return results
+
+
+# === 📒 search_cell that skips or continues what a CrawlJournal already holds ===
+def journaled_search_cell(client, cell, query, query_index, journal):
+    """
+    A tile the journal has finished costs no request; a half-crawled one
+    continues from its last page token. Every new page is journaled, and
+    the tile is marked finished only once its last page came back.
+    """
+    results = journal.done_tile(query_index, cell)
+    if results is not None:
+        return results
+
+    results, token = journal.partial_tile(query_index, cell)
+    last = None
+    for data in client.nearby_search_pages(cell.center, cell.radius, page_token=token, **query):
+        if token and last is None and data.get('status') == 'INVALID_REQUEST':
+            # ⌛ The saved page token expired: crawl the cell from its first page
+            journal.reset_tile(query_index, cell)
+            return journaled_search_cell(client, cell, query, query_index, journal)
+        last = data
+        if data.get('status') in CACHEABLE_STATUSES:
+            journal.record_page(query_index, cell, data.get('results', []), data.get('next_page_token'))
+        results.extend(data.get('results', []))
+
+    # An error mid-way leaves the last token in the journal for the next run
+    if last is not None and last.get('status') in CACHEABLE_STATUSES and not last.get('next_page_token'):
+        journal.record_tile(query_index, cell)
+    return results
+
+
+def _crawl(client, queries, collect, bounds, grid, max_depth, workers, journal=None):
+    """
+    Crawl every (cell, query) pair, splitting saturated cells, and hand each
+    tile's results to ``collect(query_index, results)`` (called under a
+    lock). Returns ``(tiles_crawled, tiles_split)``. If ``collect`` raises,
+    queued tiles are cancelled and the error is re-raised. With a
+    ``journal``, tiles finished by an earlier run are replayed from it.
+    """
+    lock = threading.Lock()
+    cells = plan_grid(bounds, grid)
+    tiles_crawled = 0
+    tiles_split = 0
+
+    def crawl_one(cell, query_index):
+        if journal is not None:
+            results = journaled_search_cell(client, cell, queries[query_index], query_index, journal)
+        else:
+            results = search_cell(client, cell, queries[query_index])
+        with lock:
+            try:
+                collect(query_index, results)
+            except Exception as e:
+                raise _CollectFailed() from e
+        return len(results)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {
+            executor.submit(crawl_one, cell, qi): (cell, qi)
+            for qi in range(len(queries)) for cell in cells
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                cell, qi = pending.pop(future)
+                tiles_crawled += 1
+                try:
+                    count = future.result()
+                except _CollectFailed as e:
+                    for other in pending:
+                        other.cancel()
+                    raise e.__cause__
+                except Exception as e:
+                    print(f"❌ Tile crawl failed for {queries[qi]} at {cell.center}: {e}")
+                    continue
+
+                # 🔄 Saturated: the cap hid results, so crawl the quadrants
+                if count >= MAX_RESULTS_PER_QUERY and cell.depth < max_depth:
+                    tiles_split += 1
+                    for child in cell.split():
+                        pending[executor.submit(crawl_one, child, qi)] = (child, qi)
+
+    return tiles_crawled, tiles_split
+
+
+# === 🚰 Crawl every query over a tiled bounding box, emitting places as they are found ===
+def stream_tiles(client, queries, emit, bounds=MELAKA_BOUNDS, grid=DEFAULT_GRID,
+                 max_depth=DEFAULT_MAX_DEPTH, workers=DEFAULT_WORKERS, journal=None, per_query=False):
+    """
+    ``queries`` is a list of keyword arguments for
+    ``PlacesClient.nearby_search_pages`` (e.g. ``{'place_type': 'museum'}``).
+    Any (cell, query) that comes back saturated at 60 results is split into
+    quadrants and crawled again. ``emit(query_index, place)`` is called the
+    first time each ``place_id`` is seen, crediting whichever query found it
+    first. With ``per_query=True`` a place is emitted once for every query
+    that finds it instead, so queries can feed different consumers. Only
+    place ids are kept in memory. A blocking ``emit`` (e.g. a full queue)
+    pauses the crawl. Tiles already in ``journal`` (a ``CrawlJournal``) are
+    not fetched again.
+    """
+    seen = set()
+    emitted = set()
+
+    def collect(query_index, results):
+        for place in results:
+            place_id = place.get('place_id')
+            if not place_id:
+                continue
+            key = (query_index, place_id) if per_query else place_id
+            if key not in emitted:
+                emitted.add(key)
+                seen.add(place_id)
+                emit(query_index, place)
+
+    tiles_crawled, tiles_split = _crawl(client, queries, collect, bounds, grid, max_depth, workers, journal)
+    print(f"🧩 Crawled {tiles_crawled} tiles ({tiles_split} split), {len(seen)} unique places")
@@ -1,7 +1,12 @@
+import argparse
 import firebase_admin
 from firebase_admin import credentials, firestore
-import requests
-from transformers import pipeline
+
+from firestore_writer import FirestoreWriter
+from places_client import PlacesClient, REVIEW_FIELDS
+from response_cache import ResponseCache
+from tag_rules import CATEGORY_RULES
+from tagging_engine import TaggingEngine, DEFAULT_BATCH_SIZE
 
 # === Firebase Setup ===
 cred = credentials.Certificate(
@@ -12,9 +17,12 @@ db = firestore.client()
 
 # === API Key ===
 API_KEY = ''
+places_client = PlacesClient(API_KEY, cache=ResponseCache())
 
 # === ML Model ===
-zero_shot_classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+# Loaded by the tagging engine on first real use, so runs with nothing
+# to tag never pay for importing transformers or loading BART-MNLI
+ZERO_SHOT_MODEL = "facebook/bart-large-mnli"
 
 PREDICTED_TAGS = [
     "Family Friendly", "Adventure", "Extreme", "Relaxing",
@@ -25,39 +33,21 @@ PREDICTED_TAGS = [
     "Educational", "Wheelchair Accessible", "Parking Available"
 ]
 
+# === Descriptions classified per engine call (results are cached after each) ===
+CLASSIFY_CHUNK_SIZE = 128
+
 # === 🔍 Get place_id by name using Text Search API ===
 def get_place_id_from_name(name):
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-    params = {
-        "query": name + " Melaka",
-        "key": API_KEY
-    }
-    try:
-        res = requests.get(url, params=params)
-        res.raise_for_status()
-        results = res.json().get("results", [])
-        if results:
-            return results[0].get("place_id")
-    except Exception as e:
-        print(f"❌ Error finding place_id for {name}: {e}")
+    results = places_client.text_search(name + " Melaka")
+    if results:
+        return results[0].get("place_id")
     return None
 
 # === 📋 Get reviews using place_id ===
+# Review-only mask; a cached scraper lookup of the same place answers it for free
 def get_reviews_from_places_api(place_id):
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
-    params = {
-        "place_id": place_id,
-        "fields": "review",
-        "key": API_KEY
-    }
-    try:
-        res = requests.get(url, params=params)
-        res.raise_for_status()
-        reviews = res.json().get("result", {}).get("reviews", [])
-        return [r.get("text", "") for r in reviews if r.get("text")]
-    except Exception as e:
-        print(f"❌ Error getting reviews for place_id {place_id}: {e}")
-        return []
+    details = places_client.get_place_details(place_id, REVIEW_FIELDS) or {}  # None: place gone
+    return [r.get("text", "") for r in details.get("reviews", []) if r.get("text")]
 
 # === 📝 Build ML Description ===
 def build_description(name, types, website, reviews):
@@ -73,112 +63,80 @@ def build_description(name, types, website, reviews):
     return description
 
 # === 🧠 Smart Tag Selector ===
+# Category rules live in tag_rules.CATEGORY_RULES, compiled once at import
 def select_tags_by_scores(name, predicted_tags_with_scores, types):
-    name_lower = name.lower()
-    types_lower = [t.lower() for t in types]
-    selected_tags = []
-
-    for tag, score in predicted_tags_with_scores:
-        # ⛱️ Resorts & Hotels
-        if any(k in name_lower for k in ["resort", "hotel"]) or "lodging" in types_lower:
-            if tag in ["Relaxing", "Family Friendly", "Photogenic", "Parking Available"]:
-                selected_tags.append(tag)
-
-        # 🎢 Parks
-        elif ("theme park" in name_lower or "water park" in name_lower or "amusement" in types_lower) and tag in ["Family Friendly", "Adventure", "Photogenic"]:
-            selected_tags.append(tag)
-
-        # 🏛️ Museums & Galleries
-        elif "museum" in name_lower or "museum" in types_lower:
-            if tag in ["Historical", "Educational", "Cultural"]:
-                selected_tags.append(tag)
-        elif "gallery" in name_lower and tag in ["Photogenic", "Instagrammable", "Cultural"]:
-            selected_tags.append(tag)
-
-        # 🏖️ Beaches
-        elif any(k in name_lower for k in ["beach", "bay"]) or "natural_feature" in types_lower:
-            if tag in ["Beach", "Relaxing", "Nature"]:
-                selected_tags.append(tag)
-
-        # ☕ Cafes
-        elif any(k in name_lower for k in ["cafe", "coffee"]) or "cafe" in types_lower:
-            if tag in ["Foodie", "Relaxing"]:
-                selected_tags.append(tag)
-
-        # 🛍️ Malls
-        elif any(k in name_lower for k in ["mall", "market"]) or "shopping_mall" in types_lower:
-            if tag in ["Shopping", "Budget Friendly", "Foodie"]:
-                selected_tags.append(tag)
-
-        # 🍽️ Restaurants
-        elif "restaurant" in name_lower or "restaurant" in types_lower:
-            if tag in ["Foodie", "Local Cuisine"]:
-                selected_tags.append(tag)
-
-        # 🏕️ Camping
-        elif "camp" in name_lower or "campground" in types_lower:
-            if tag in ["Nature", "Adventure", "Relaxing"]:
-                selected_tags.append(tag)
-
-        # 🕌 Religious Places
-        elif any(k in name_lower for k in ["masjid", "mosque", "gereja", "church", "temple", "tokong", "kuil"]) or "place_of_worship" in types_lower:
-            if tag in ["Cultural", "Historical", "Heritage", "Religious", "Photogenic"]:
-                selected_tags.append(tag)
-
-        # 🏰 A Famosa Special Case
-        elif "a famosa" in name_lower:
-            if "water" in name_lower and tag in ["Family Friendly", "Adventure"]:
-                selected_tags.append(tag)
-            elif tag in ["Historical", "Heritage", "Photogenic"]:
-                selected_tags.append(tag)
-
-        # ✅ Score-based fallback
-        elif score >= 0.09:
-            selected_tags.append(tag)
-
-    return list(set(selected_tags))
-
-# === 🔄 Update Firestore ===
-# === 🔄 Update Firestore ===
-def update_existing_places_by_name():
-    docs = db.collection("melaka_places").stream()
+    return CATEGORY_RULES.select_tags(name, predicted_tags_with_scores, types)
 
-    for doc in docs:
-        data = doc.to_dict()
-        name = data.get("name")
-        types = data.get("types", [])
-        website = data.get("website")
-        existing_tags = data.get("tags_suggested_by_ml")
+# === 🔢 Pre-pass: ids of untagged places, streaming only the tags field ===
+def find_untagged_place_ids():
+    docs = db.collection("melaka_places").select(["tags_suggested_by_ml"]).stream()
+    return [doc.id for doc in docs if not doc.to_dict().get("tags_suggested_by_ml")]
 
-        if existing_tags:
-            print(f"⏭️ Skipping {name}: tags already exist")
-            continue
 
-        print(f"\n🔍 Processing: {name}")
-        place_id = data.get("place_id")
+# === 🔄 Update Firestore ===
+def update_existing_places_by_name(batch_size=DEFAULT_BATCH_SIZE, workers=1):
+    untagged_ids = find_untagged_place_ids()
+    if not untagged_ids:
+        print("⏭️ All places already have tags, nothing to do")
+        return
+    print(f"🔢 {len(untagged_ids)} places need tags")
+
+    engine = TaggingEngine(PREDICTED_TAGS, model=ZERO_SHOT_MODEL,
+                           batch_size=batch_size, workers=workers)
+    refs = [db.collection("melaka_places").document(doc_id) for doc_id in untagged_ids]
+    # Only the fields needed for a description, not reviews/photos
+    docs = db.get_all(refs, field_paths=["name", "types", "website", "place_id"])
+    pending = []  # (doc id, name, types, description)
+
+    with FirestoreWriter(db) as writer:
+        # 📝 Pass 1: build a description for every untagged place
+        for doc in docs:
+            data = doc.to_dict() or {}
+            name = data.get("name")
+            types = data.get("types", [])
+            website = data.get("website")
+
+            print(f"\n🔍 Processing: {name}")
+            place_id = data.get("place_id")
 
-        if not place_id:
-            place_id = get_place_id_from_name(name)
             if not place_id:
-                print(f"⚠️ Skipped {name}: place_id not found")
-                continue
-            db.collection("melaka_places").document(doc.id).update({
-                "place_id": place_id
-            })
-            print(f"📌 Stored place_id for {name}")
-
-        reviews = get_reviews_from_places_api(place_id)
-        description = build_description(name, types, website, reviews)
-
-        prediction = zero_shot_classifier(description, candidate_labels=PREDICTED_TAGS)
-        predicted_tags = list(zip(prediction["labels"], prediction["scores"]))
-        selected_tags = select_tags_by_scores(name, predicted_tags, types)
-
-        db.collection("melaka_places").document(doc.id).update({
-            "tags_suggested_by_ml": selected_tags
-        })
+                place_id = get_place_id_from_name(name)
+                if not place_id:
+                    print(f"⚠️ Skipped {name}: place_id not found")
+                    continue
+                writer.update(db.collection("melaka_places").document(doc.id), {
+                    "place_id": place_id
+                })
+                print(f"📌 Stored place_id for {name}")
+
+            reviews = get_reviews_from_places_api(place_id)
+            description = build_description(name, types, website, reviews)
+            pending.append((doc.id, name, types, description))
+
+        # 🧠 Pass 2: classify in batches, then write the selected tags
+        for start in range(0, len(pending), CLASSIFY_CHUNK_SIZE):
+            chunk = pending[start:start + CLASSIFY_CHUNK_SIZE]
+            predictions = engine.classify([description for _, _, _, description in chunk])
+
+            for (doc_id, name, types, _), predicted_tags in zip(chunk, predictions):
+                selected_tags = select_tags_by_scores(name, predicted_tags, types)
+                writer.update(db.collection("melaka_places").document(doc_id), {
+                    "tags_suggested_by_ml": selected_tags
+                })
+                print(f"✅ Updated {name} with tags: {selected_tags}")
 
-        print(f"✅ Updated {name} with tags: {selected_tags}")
 # === 🚀 Run Script ===
 if __name__ == "__main__":
-    update_existing_places_by_name()
+    parser = argparse.ArgumentParser(description="Suggest ML tags for places in Firestore")
+    parser.add_argument('--offline', action='store_true',
+                        help="Replay cached Places responses only, without touching the network")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Descriptions per forward-pass batch")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Classifier processes for multi-process CPU mode")
+    args = parser.parse_args()
+    places_client.cache.offline = args.offline
+
+    update_existing_places_by_name(batch_size=args.batch_size, workers=args.workers)
+    print(places_client.cache.summary())
+    print(places_client.summary())
@@ -1,8 +1,10 @@
 import firebase_admin
 from firebase_admin import credentials, firestore, storage
-import requests
+import hashlib
 import json
-import uuid
+
+from firestore_writer import FirestoreWriter
+from image_pipeline import ImagePipeline, ORIGINAL
 
 # === Step 1: Initialize Firebase ===
 cred = credentials.Certificate(
@@ -18,41 +20,30 @@ bucket = storage.bucket()
 with open("tiket_all_data.json", "r", encoding="utf-8") as f:
     data = json.load(f)
 
-# === Step 3: Upload image to Firebase Storage and return URL ===
-def upload_image_to_storage(image_url):
-    try:
-        response = requests.get(image_url)
-        response.raise_for_status()
-        image_data = response.content
-
-        # Generate unique filename
-        file_name = f"ticket/{uuid.uuid4()}.jpg"
-
-        # Create blob and upload
-        blob = bucket.blob(file_name)
-        blob.upload_from_string(image_data, content_type='image/jpeg')
-
-        # Make image public (optional)
-        blob.make_public()
-
-        return blob.public_url
-    except Exception as e:
-        print(f"⚠️ Failed to upload image: {e}")
-        return None
-
-# === Step 4: Loop and upload ===
-for i, item in enumerate(data):
-    print(f"\n📦 Processing item {i+1}: {item.get('title')}")
-    item_copy = dict(item)
-
-    uploaded_image_urls = []
-    for img_url in item.get("images", []):
-        new_url = upload_image_to_storage(img_url)
-        if new_url:
-            uploaded_image_urls.append(new_url)
-
-    item_copy["images"] = uploaded_image_urls
-    db.collection("list_ticket").add(item_copy)
-    print("✅ Uploaded to Firestore with Firebase Storage image URLs.")
+# === Step 3: Content-addressed image uploads (reruns skip stored images) ===
+image_pipeline = ImagePipeline(bucket, prefix="ticket", variants=None)  # keep images as-is
+
+
+# === 🆔 Same event, same document on every rerun (titles repeat, source URLs don't) ===
+def ticket_doc_id(item):
+    key = item.get("source") or item.get("title") or ""
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+# === Step 4: Loop and upload (documents are committed in batches) ===
+# All images of all items are downloaded and uploaded in parallel first
+all_image_urls = image_pipeline.upload_groups([item.get("images", []) for item in data])
+image_pipeline.close()
+print(image_pipeline.summary())
+
+with FirestoreWriter(db) as writer:
+    for i, (item, uploaded_image_urls) in enumerate(zip(data, all_image_urls)):
+        print(f"\n📦 Processing item {i+1}: {item.get('title')}")
+        item_copy = dict(item)
+        item_copy["images"] = [v[ORIGINAL] for v in uploaded_image_urls]
+        # Merged, so fields added to the document outside this script survive a rerun
+        doc_ref = db.collection("list_ticket").document(ticket_doc_id(item))
+        writer.set(doc_ref, item_copy, merge=True)
+        print("✅ Queued for Firestore with Firebase Storage image URLs.")
 
 print("\n🎉 All data uploaded successfully.")